@@ -3,20 +3,43 @@ from config import Config
 from extensions import init_extensions, db
 from routes import register_routes
 from utils.faq_memory import load_faq_into_memory
+from utils.product_catalog import product_catalog
+from utils.ticket_search import ensure_search_index
+from utils.ai_client import configure_provider
+from models.agent_stats import AgentStats
+from models.counter import Counter
+from models.table_version import TableVersion, PRODUCTS, FAQS
+from utils.jobs import start_periodic
+from utils.json_provider import init_json_provider
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
     init_extensions(app)
+    init_json_provider(app)
+    configure_provider(app.config.get("AI_PROVIDER"), app.config.get("AI_API_KEY"))
 
     # Create DB models if using sqlite for quick demo
     with app.app_context():
         db.create_all()
+        ensure_search_index()
+        AgentStats.backfill_if_empty()
+        Counter.reconcile()
+        # Writes made while the app was down (seed scripts, migrations) never
+        # bumped a stamp; start from a fresh one so cached ETags revalidate
+        for table in (PRODUCTS, FAQS):
+            TableVersion.bump(table)
+        db.session.commit()
         load_faq_into_memory()
+        product_catalog.load()
 
     register_routes(app)
 
+    if not app.testing:
+        start_periodic(app, app.config.get("COUNTER_RECONCILE_INTERVAL", 0),
+                       Counter.reconcile, "reconcile-counters")
+
     @app.route("/health")
     def health():
         return jsonify({"status": "ok"})
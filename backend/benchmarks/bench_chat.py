@@ -0,0 +1,82 @@
+"""Latency/throughput benchmark for the AI chat path, fully offline.
+
+Uses the fake provider (AI_PROVIDER=fake), so numbers reflect our own
+overhead plus the simulated provider latency:
+
+    python -m benchmarks.bench_chat --requests 500 --concurrency 16 \
+        --latency lognormal:0.2:0.5 --distinct 50
+"""
+import argparse
+import json
+import os
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mode", choices=["chat", "stream", "batch"], default="chat")
+    parser.add_argument("--latency", default="lognormal:0.1:0.5",
+                        help="fake provider latency spec (fixed:S, uniform:A:B, normal:MU:SD, lognormal:MEDIAN:SIGMA)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-words", type=int, default=3)
+    parser.add_argument("--distinct", type=int, default=0,
+                        help="number of distinct queries to cycle through (0 = every query unique)")
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["AI_FAKE_LATENCY"] = args.latency
+    os.environ["AI_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["AI_FAKE_CHUNK_WORDS"] = str(args.chunk_words)
+    os.environ.setdefault("AI_FAKE_SEED", "1")
+
+    from benchmarks.common import make_app, auth_headers, run_concurrent, summarize
+
+    app = make_app()
+    headers = auth_headers(app)
+
+    def query(i):
+        n = i % args.distinct if args.distinct else i
+        return f"my device number {n} keeps rebooting"
+
+    ttfb = []
+
+    def chat(i):
+        resp = app.test_client().post("/api/ai/chat", json={"query": query(i)}, headers=headers)
+        if resp.status_code != 200:
+            raise RuntimeError(resp.status_code)
+
+    def stream(i):
+        started = time.perf_counter()
+        resp = app.test_client().post("/api/ai/chat/stream", json={"query": query(i)},
+                                      headers=headers, buffered=False)
+        first = True
+        for _ in resp.response:
+            if first:
+                ttfb.append(time.perf_counter() - started)
+                first = False
+        resp.close()
+
+    def batch(i):
+        queries = [query(i * args.batch_size + j) for j in range(args.batch_size)]
+        resp = app.test_client().post("/api/ai/chat/batch", json={"queries": queries}, headers=headers)
+        if resp.status_code != 200:
+            raise RuntimeError(resp.status_code)
+
+    fn = {"chat": chat, "stream": stream, "batch": batch}[args.mode]
+    latencies, errors, wall = run_concurrent(fn, args.requests, args.concurrency)
+
+    print(f"mode={args.mode} latency={args.latency} error_rate={args.error_rate} "
+          f"concurrency={args.concurrency} distinct={args.distinct or 'all'}")
+    summarize(args.mode, latencies, wall, errors)
+    if ttfb:
+        summarize("stream-ttfb", ttfb, wall)
+
+    with app.app_context():
+        stats = app.test_client().get("/api/ai/stats", headers=headers).get_json()
+    print(json.dumps(stats, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
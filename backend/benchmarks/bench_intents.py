@@ -0,0 +1,78 @@
+"""Compare the fallback intent matcher with the old keyword chain.
+
+    python -m benchmarks.bench_intents --messages 20000 --extra-rules 50
+
+The legacy chain does one substring scan per keyword and stops at the
+first rule that hits, so its cost grows with the number of rules; the
+matcher classifies with one regex pass over the message.
+"""
+import argparse
+import random
+import timeit
+
+from utils.intent_matcher import DEFAULT_INTENTS, DEFAULT_RESPONSE, IntentMatcher
+
+# The original get_fallback_response: one substring scan per rule
+LEGACY_RULES = [
+    (["hello", "hi", "hey"], DEFAULT_INTENTS[0]["response"]),
+    (["battery", "charging"], DEFAULT_INTENTS[1]["response"]),
+    (["screen", "display"], DEFAULT_INTENTS[2]["response"]),
+    (["slow", "performance"], DEFAULT_INTENTS[3]["response"]),
+    (["ticket", "support", "help"], DEFAULT_INTENTS[4]["response"]),
+    (["warranty", "repair"], DEFAULT_INTENTS[5]["response"]),
+]
+
+
+def legacy_fallback(message, rules=LEGACY_RULES):
+    message = message.lower()
+    for words, response in rules:
+        if any(word in message for word in words):
+            return response
+    return DEFAULT_RESPONSE
+
+
+WORDS = ("my phone laptop tv refrigerator keeps turning off after the update and "
+         "it is really annoying because I need it for work every single day").split()
+KEYWORDS = ["battery", "screen", "slow", "warranty", "ticket", "charging", "display"]
+
+
+def make_messages(n, seed=1):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(5, 40))
+        if rng.random() < 0.7:
+            words.insert(rng.randrange(len(words)), rng.choice(KEYWORDS))
+        messages.append(" ".join(words))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--extra-rules", type=int, default=0,
+                        help="append N synthetic low-priority rules to both implementations")
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    extra = [
+        {"name": f"extra{i}", "priority": -i, "keywords": [f"kwa{i}", f"kwb{i}", f"kwc{i}"], "response": f"extra {i}"}
+        for i in range(args.extra_rules)
+    ]
+    legacy_rules = LEGACY_RULES + [(r["keywords"], r["response"]) for r in extra]
+    matcher = IntentMatcher(DEFAULT_INTENTS + extra)
+
+    legacy = lambda m: legacy_fallback(m, legacy_rules)
+    for name, fn in (("legacy", legacy), ("matcher", matcher.respond)):
+        best = min(timeit.repeat(lambda: [fn(m) for m in messages], number=1, repeat=args.repeat))
+        print(f"{name:9s} {best * 1e6 / len(messages):8.2f} us/message  ({best:.3f}s for {len(messages)})")
+
+    # Substring matching misfires on words like "this" or "which" (contain
+    # "hi"); count where the two disagree.
+    diff = sum(legacy(m) != matcher.respond(m) for m in messages)
+    print(f"disagreements: {diff}/{len(messages)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the block-based order id allocator.
+
+    python -m benchmarks.bench_order_ids --ids 100000 --orders 2000
+    python -m benchmarks.bench_order_ids --processes 4 --db /tmp/ids.db
+
+Reports raw allocations/s from several threads, end-to-end
+/api/orders/create throughput, and (with --processes) checks that
+processes sharing one SQLite file never receive the same id.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.common import make_app, auth_headers, run_concurrent, summarize
+
+
+def _allocate_in_process(args):
+    db_path, n, block_size = args
+    from utils.id_allocator import IdAllocator
+
+    app = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}")
+    allocator = IdAllocator("bench", prefix="P-", start=10000, block_size=block_size)
+    with app.app_context():
+        return [allocator.next_id() for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--block-size", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--db", default=None, help="SQLite file for --processes (default: a temp file)")
+    args = parser.parse_args()
+
+    from utils.id_allocator import IdAllocator
+
+    app = make_app()
+    allocator = IdAllocator("bench", prefix="P-", start=10000, block_size=args.block_size)
+    issued = []
+
+    def allocate(n):
+        with app.app_context():
+            ids = [allocator.next_id() for _ in range(n)]
+        issued.extend(ids)
+
+    threads = [threading.Thread(target=allocate, args=(args.ids // args.threads,)) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    print(f"allocator: {len(issued)} ids in {elapsed:.3f}s = {len(issued) / elapsed:,.0f} ids/s "
+          f"({allocator.blocks} blocks, {len(set(issued)) == len(issued) and 'all unique' or 'DUPLICATES'})")
+
+    client = app.test_client()
+    headers = auth_headers(app, role="customer")
+    body = {"device_type": "mobile", "component_name": "Battery"}
+
+    def create(i):
+        resp = client.post("/api/orders/create", json=body, headers=headers)
+        if resp.status_code != 201:
+            raise RuntimeError(resp.get_json())
+
+    latencies, errors, wall = run_concurrent(create, args.orders, 1)
+    summarize("orders.create", latencies, wall, errors)
+
+    if args.processes:
+        db_path = args.db or os.path.join(tempfile.mkdtemp(), "ids.db")
+        per_process = args.ids // args.processes
+        make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}")  # create the schema once
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(_allocate_in_process, [(db_path, per_process, args.block_size)] * args.processes)
+        all_ids = [i for ids in results for i in ids]
+        print(f"{args.processes} processes: {len(all_ids)} ids, {len(set(all_ids))} unique")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time list serialization: ORM objects + to_dict + stdlib JSON versus
+plain column rows + RowSerializer + orjson.
+
+    python -m benchmarks.bench_serialization --rows 100000
+
+Each variant runs inside an app context against an in-memory SQLite
+database seeded with tickets that all reference a product. Reported times
+cover fetch + dict building + JSON encoding, which is what a list endpoint
+spends per request.
+"""
+import argparse
+import time
+from datetime import datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+from benchmarks.common import make_app
+
+
+def seed(n_rows, n_products=500):
+    from extensions import db
+    from models.product import Product
+    from models.ticket import Ticket
+
+    db.session.execute(Product.__table__.insert(), [
+        {"name": f"Product {i}", "model": f"M{i}", "category": ("mobile", "tv", "laptop")[i % 3],
+         "brand": "Acme", "price": 99.0 + i, "description": "bench product"}
+        for i in range(1, n_products + 1)
+    ])
+    now = datetime.now()
+    db.session.execute(Ticket.__table__.insert(), [
+        {"description": f"ticket {i}: screen flickers after the latest update", "status": "Open",
+         "customer_id": 1 + i % 50, "product_id": 1 + i % n_products, "assigned_to": None,
+         "created_at": now, "preferred_time_slot": "10:00 AM - 12:00 PM",
+         "contact": "+1 555 0100", "pickup_address": "1 Main St"}
+        for i in range(n_rows)
+    ])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = make_app()
+    from extensions import db
+    from models.ticket import Ticket, TICKET_ROW
+
+    stdlib = DefaultJSONProvider(app)
+
+    def orm_path():
+        tickets = Ticket.query.order_by(Ticket.id).all()
+        body = stdlib.dumps([t.to_dict() for t in tickets])
+        db.session.expunge_all()
+        return body
+
+    def row_path():
+        rows = Ticket.rows_query().order_by(Ticket.id).all()
+        return app.json.dumps([TICKET_ROW(r) for r in rows])
+
+    with app.app_context():
+        seed(args.rows)
+        print(f"rows={args.rows} provider={type(app.json).__name__}")
+        results = {}
+        for name, fn in (("orm+to_dict+json", orm_path), ("rows+serializer+" + type(app.json).__name__, row_path)):
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                body = fn()
+                best = min(best, time.perf_counter() - started)
+            results[name] = best
+            print(f"{name:32s} {best:7.3f}s  {args.rows / best:10.0f} rows/s  {len(body) / 1e6:6.1f} MB")
+        orm, rows = results.values()
+        print(f"speedup: {orm / rows:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
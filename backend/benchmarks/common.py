@@ -0,0 +1,96 @@
+"""Shared helpers for the offline benchmarks.
+
+Run benchmarks from the backend directory, e.g.
+    python -m benchmarks.bench_chat --help
+"""
+import os
+import statistics
+import threading
+import time
+
+# The default OpenRouter provider refuses to start without a key
+os.environ.setdefault("OPENROUTER_API_KEY", "offline-benchmark")
+
+from config import Config
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    TESTING = True
+    JWT_SECRET_KEY = "offline-benchmark-jwt-secret-0123456789"
+    AI_PROVIDER = "fake"
+
+
+def make_app(**overrides):
+    from app import create_app
+
+    config = type("Config", (BenchConfig,), overrides)
+    return create_app(config)
+
+
+def auth_headers(app, role="admin", user_id="1"):
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        token = create_access_token(identity=user_id, additional_claims={"role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def run_concurrent(fn, n_requests, concurrency):
+    """Call fn(i) n_requests times from `concurrency` threads.
+
+    Returns (latencies_in_seconds, errors, wall_seconds).
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            try:
+                fn(i)
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - started
+
+
+def summarize(name, latencies, wall, errors=()):
+    lat = sorted(latencies)
+    ms = lambda s: round(s * 1000, 2)
+    row = {
+        "name": name,
+        "requests": len(lat) + len(errors),
+        "errors": len(errors),
+        "rps": round(len(lat) / wall, 1) if wall else 0.0,
+        "p50_ms": ms(percentile(lat, 50)),
+        "p95_ms": ms(percentile(lat, 95)),
+        "p99_ms": ms(percentile(lat, 99)),
+        "mean_ms": ms(statistics.fmean(lat)) if lat else 0.0,
+    }
+    print("  ".join(f"{k}={v}" for k, v in row.items()))
+    return row
@@ -20,3 +20,26 @@ class Config:
 
     AI_PROVIDER = os.getenv("AI_PROVIDER", "openrouter")
     AI_API_KEY = os.getenv("AI_API_KEY")
+
+    # List endpoints: default and maximum page size (?limit=)
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT") or 100)
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX") or 500)
+    # Rows fetched and written per chunk by ?format=ndjson exports
+    NDJSON_CHUNK_SIZE = int(os.getenv("NDJSON_CHUNK_SIZE") or 1000)
+
+    # "orjson" (falls back to the stdlib provider if not installed) or "default"
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+    # Bulk ticket import: rows per executemany/commit, and max rows per upload
+    TICKET_IMPORT_BATCH_SIZE = int(os.getenv("TICKET_IMPORT_BATCH_SIZE") or 1000)
+    TICKET_IMPORT_MAX_ROWS = int(os.getenv("TICKET_IMPORT_MAX_ROWS") or 100000)
+
+    # Max ids accepted by one bulk status update
+    BULK_UPDATE_MAX_IDS = int(os.getenv("BULK_UPDATE_MAX_IDS") or 10000)
+
+    # Cache-Control max-age for ETag-validated catalog/FAQ responses; 0 means
+    # clients and proxies keep the body but revalidate on every use
+    CONDITIONAL_GET_MAX_AGE = int(os.getenv("CONDITIONAL_GET_MAX_AGE") or 0)
+
+    # Seconds between counter reconciliation runs (0 disables)
+    COUNTER_RECONCILE_INTERVAL = int(os.getenv("COUNTER_RECONCILE_INTERVAL") or 3600)
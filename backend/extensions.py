@@ -20,5 +20,6 @@ def init_extensions(app):
     CORS(app, 
          origins=['http://localhost:3000', 'http://127.0.0.1:3000', 'https://localhost:3000'],
          allow_headers=['Content-Type', 'Authorization'],
+         expose_headers=['X-Next-Cursor', 'Link'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
          supports_credentials=True)
@@ -0,0 +1,44 @@
+"""add indexes for hot filter columns
+
+Revision ID: 3f1c2a9b7d10
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Tables are still created by db.create_all() in create_app, which also
+creates these indexes on fresh databases; if_not_exists makes the upgrade
+safe on both fresh and existing databases.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_tickets_customer_id_id', 'tickets', ['customer_id', 'id']),
+    ('ix_tickets_assigned_to_closed_at', 'tickets', ['assigned_to', 'closed_at']),
+    ('ix_tickets_product_id_id', 'tickets', ['product_id', 'id']),
+    ('ix_tickets_status_id', 'tickets', ['status', 'id']),
+    ('ix_tickets_created_at', 'tickets', ['created_at']),
+    ('ix_component_orders_customer_id_id', 'component_orders', ['customer_id', 'id']),
+    ('ix_component_orders_ticket_id', 'component_orders', ['ticket_id']),
+    ('ix_component_orders_status_id', 'component_orders', ['status', 'id']),
+    ('ix_agent_review_user_id', 'agent_review', ['user_id']),
+    ('ix_products_name_category', 'products', ['name', 'category']),
+    ('ix_products_category_id', 'products', ['category', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
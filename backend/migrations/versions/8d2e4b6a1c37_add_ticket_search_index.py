@@ -0,0 +1,63 @@
+"""add full-text search index on ticket descriptions
+
+Revision ID: 8d2e4b6a1c37
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 12:00:00.000000
+
+SQLite gets an external-content FTS5 table kept in sync by triggers;
+Postgres gets a GIN expression index on to_tsvector(description).
+create_app runs the same DDL through utils.ticket_search, so both are
+idempotent.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b6a1c37'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+        description, content='tickets', content_rowid='id', tokenize='porter unicode61')""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO tickets_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    "INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS tickets_fts_au",
+    "DROP TRIGGER IF EXISTS tickets_fts_ad",
+    "DROP TRIGGER IF EXISTS tickets_fts_ai",
+    "DROP TABLE IF EXISTS tickets_fts",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for ddl in SQLITE_UPGRADE:
+            op.execute(ddl)
+    elif dialect == 'postgresql':
+        op.execute("""CREATE INDEX IF NOT EXISTS ix_tickets_description_fts ON tickets
+            USING GIN (to_tsvector('english', coalesce(description, '')))""")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for ddl in SQLITE_DOWNGRADE:
+            op.execute(ddl)
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_tickets_description_fts")
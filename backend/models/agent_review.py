@@ -3,6 +3,9 @@ from sqlalchemy import func
 
 class Agent_review(db.Model):
     __tablename__ = 'agent_review'
+    __table_args__ = (
+        db.Index('ix_agent_review_user_id', 'user_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     rating = db.Column(db.Integer, nullable=False)
     feedback = db.Column(db.String(100))
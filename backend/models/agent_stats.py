@@ -0,0 +1,98 @@
+from extensions import db
+from datetime import datetime
+from sqlalchemy import func
+from utils.upsert import upsert_increment
+
+
+def duration_seconds(start, end):
+    """SQL expression for (end - start) in seconds on SQLite and Postgres."""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract('epoch', end - start)
+
+
+class AgentStats(db.Model):
+    """Per-agent dashboard rollup, updated as tickets close and reviews arrive."""
+    __tablename__ = 'agent_stats'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    resolved_count = db.Column(db.Integer, nullable=False, default=0)
+    resolution_seconds = db.Column(db.Float, nullable=False, default=0.0)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    @classmethod
+    def record_resolution(cls, user_id, created_at, closed_at):
+        seconds = (closed_at - created_at).total_seconds() if created_at else 0.0
+        cls.add_resolutions(user_id, 1, seconds)
+
+    @classmethod
+    def add_resolutions(cls, user_id, count, seconds):
+        upsert_increment(cls, {'user_id': user_id},
+                         {'resolved_count': count, 'resolution_seconds': seconds})
+
+    @classmethod
+    def record_review(cls, user_id, rating):
+        upsert_increment(cls, {'user_id': user_id},
+                         {'review_count': 1, 'rating_sum': int(rating)})
+
+    @classmethod
+    def live_totals(cls):
+        """One GROUP BY query computing the same totals from the source
+        tables; returns {user_id: (resolved, seconds, reviews, rating_sum)}."""
+        from models.ticket import Ticket
+        from models.agent_review import Agent_review
+
+        resolved = (
+            db.session.query(
+                Ticket.assigned_to.label('user_id'),
+                func.count(Ticket.id).label('resolved'),
+                func.coalesce(func.sum(duration_seconds(Ticket.created_at, Ticket.closed_at)), 0).label('seconds'),
+                db.literal(0).label('reviews'),
+                db.literal(0).label('rating_sum'),
+            )
+            .filter(Ticket.assigned_to.isnot(None), Ticket.closed_at.isnot(None))
+            .group_by(Ticket.assigned_to)
+        )
+        reviews = (
+            db.session.query(
+                Agent_review.user_id.label('user_id'),
+                db.literal(0).label('resolved'),
+                db.literal(0.0).label('seconds'),
+                func.count(Agent_review.id).label('reviews'),
+                func.coalesce(func.sum(Agent_review.rating), 0).label('rating_sum'),
+            )
+            .filter(Agent_review.user_id.isnot(None))
+            .group_by(Agent_review.user_id)
+        )
+        totals = {}
+        for user_id, n, secs, r, rsum in resolved.union_all(reviews).all():
+            t = totals.setdefault(user_id, [0, 0.0, 0, 0])
+            t[0] += n
+            t[1] += float(secs or 0)
+            t[2] += r
+            t[3] += rsum
+        return {k: tuple(v) for k, v in totals.items()}
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every row from the source tables (backfill / repair)."""
+        cls.query.delete()
+        for user_id, (n, secs, r, rsum) in cls.live_totals().items():
+            db.session.add(cls(user_id=user_id, resolved_count=n, resolution_seconds=secs,
+                               review_count=r, rating_sum=rsum))
+        db.session.commit()
+
+    @classmethod
+    def backfill_if_empty(cls):
+        if db.session.query(cls.user_id).first() is None:
+            cls.rebuild()
+
+    @staticmethod
+    def dashboard_fields(resolved, seconds, reviews, rating_sum):
+        return {
+            'ticket_resolved': resolved,
+            'avg_time': (seconds / resolved / 3600) if resolved else 0,  # hours
+            'rating': (rating_sum / reviews) if reviews else 0,
+            'feedback': reviews,
+        }
@@ -1,8 +1,15 @@
 from extensions import db
 from datetime import datetime
+from models.ticket import Ticket
+from utils.row_serializer import RowSerializer
 
 class ComponentOrder(db.Model):
     __tablename__ = 'component_orders'
+    __table_args__ = (
+        db.Index('ix_component_orders_customer_id_id', 'customer_id', 'id'),
+        db.Index('ix_component_orders_ticket_id', 'ticket_id'),
+        db.Index('ix_component_orders_status_id', 'status', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.String(50), unique=True, nullable=False)  # P-1234 format
     customer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -22,12 +29,20 @@ class ComponentOrder(db.Model):
     customer = db.relationship('User', foreign_keys=[customer_id], backref='component_orders', lazy=True)
     ticket = db.relationship('Ticket', foreign_keys=[ticket_id], backref='component_orders', lazy=True)
 
+    @classmethod
+    def rows_query(cls):
+        """Column-tuple query (orders LEFT JOIN tickets) for read-only
+        lists; serialize with ORDER_ROW. One query, no ORM objects."""
+        return (
+            db.session.query(*ORDER_ROW.columns())
+            .select_from(cls)
+            .outerjoin(Ticket, cls.ticket_id == Ticket.id)
+        )
+
     def to_dict(self):
-        # Import here to avoid circular imports
-        from models.ticket import Ticket
         ticket_data = None
         if self.ticket_id:
-            ticket = Ticket.query.get(self.ticket_id)
+            ticket = self.ticket
             if ticket:
                 ticket_data = {
                     'id': ticket.id,
@@ -51,4 +66,26 @@ class ComponentOrder(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'shipped_at': self.shipped_at.isoformat() if self.shipped_at else None,
             'delivered_at': self.delivered_at.isoformat() if self.delivered_at else None,
-        }
\ No newline at end of file
+        }
+
+ORDER_ROW = RowSerializer([
+    ('id', ComponentOrder.id),
+    ('order_id', ComponentOrder.order_id),
+    ('customer_id', ComponentOrder.customer_id),
+    ('ticket_id', ComponentOrder.ticket_id),
+    ('ticket', RowSerializer([
+        ('id', Ticket.id),
+        ('description', Ticket.description),
+        ('status', Ticket.status),
+    ])),
+    ('device_type', ComponentOrder.device_type),
+    ('component_name', ComponentOrder.component_name),
+    ('quantity', ComponentOrder.quantity),
+    ('price', ComponentOrder.price),
+    ('status', ComponentOrder.status),
+    ('service_tier', ComponentOrder.service_tier),
+    ('notes', ComponentOrder.notes),
+    ('created_at', ComponentOrder.created_at),
+    ('shipped_at', ComponentOrder.shipped_at),
+    ('delivered_at', ComponentOrder.delivered_at),
+])
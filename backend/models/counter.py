@@ -0,0 +1,63 @@
+from extensions import db
+from datetime import datetime
+from utils.upsert import upsert_increment
+
+TICKETS_TOTAL = 'tickets_total'
+TICKETS_CLOSED = 'tickets_closed'
+PRODUCTS_TOTAL = 'products_total'
+
+
+class Counter(db.Model):
+    """Named row counts kept up to date by the write paths."""
+    __tablename__ = 'counters'
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    reconciled_at = db.Column(db.DateTime)
+
+    @classmethod
+    def add(cls, name, delta=1):
+        """Stage an increment in the caller's transaction."""
+        if delta:
+            upsert_increment(cls, {'name': name}, {'value': delta})
+
+    @classmethod
+    def get_many(cls, names):
+        rows = dict(db.session.query(cls.name, cls.value).filter(cls.name.in_(names)).all())
+        return {n: rows.get(n, 0) for n in names}
+
+    @classmethod
+    def sources(cls):
+        """COUNT(*) query behind each counter, used to reconcile drift."""
+        from models.ticket import Ticket
+        from models.product import Product
+        return {
+            TICKETS_TOTAL: db.select(db.func.count(Ticket.id)),
+            TICKETS_CLOSED: db.select(db.func.count(Ticket.id)).where(Ticket.status == 'Closed'),
+            PRODUCTS_TOTAL: db.select(db.func.count(Product.id)),
+        }
+
+    @classmethod
+    def reconcile(cls):
+        """Reset every counter to its true count; returns {name: drift}.
+
+        The counter row is locked (SELECT ... FOR UPDATE) before its COUNT(*)
+        runs as a separate statement. Under READ COMMITTED (the Postgres
+        default) each statement reads a fresh snapshot, so a concurrent
+        increment either committed before the lock was granted and its row
+        is counted, or waits for the lock and adds on top of the new value.
+        SQLite serializes writers, so there the upsert alone excludes them.
+        Each counter is committed on its own to keep the lock short.
+        """
+        drift = {}
+        for name, source in cls.sources().items():
+            upsert_increment(cls, {'name': name}, {'value': 0})  # make sure the row exists
+            before = db.session.query(cls.value).filter(cls.name == name).with_for_update().scalar()
+            count = db.session.execute(source).scalar()
+            db.session.execute(
+                cls.__table__.update()
+                .where(cls.name == name)
+                .values(value=count, reconciled_at=datetime.now())
+            )
+            db.session.commit()
+            drift[name] = count - before
+        return drift
@@ -0,0 +1,29 @@
+from extensions import db
+from datetime import datetime
+from models.table_version import TableVersion, FAQS
+
+class FaqChange(db.Model):
+    """Append-only log of FAQ writes; its max id is the FAQ version stamp.
+
+    Workers sync by reading versions above the last one they applied, which
+    only works if versions become visible in order. record() therefore bumps
+    the faqs TableVersion row first: its row lock is held until commit, so
+    concurrent FAQ writers take their versions one after the other and
+    commit in version order.
+    """
+    __tablename__ = 'faq_changes'
+    version = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    faq_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # add, edit, delete
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    @classmethod
+    def current_version(cls):
+        return db.session.query(db.func.max(cls.version)).scalar() or 0
+
+    @classmethod
+    def record(cls, faq_id, op):
+        """Stage a change row (and the faqs stamp bump) in the caller's
+        transaction."""
+        TableVersion.bump(FAQS)
+        db.session.add(cls(faq_id=faq_id, op=op))
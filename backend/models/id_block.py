@@ -0,0 +1,8 @@
+from extensions import db
+
+
+class IdBlock(db.Model):
+    """How many ids each named allocator has handed out in blocks."""
+    __tablename__ = 'id_blocks'
+    name = db.Column(db.String(50), primary_key=True)
+    allocated = db.Column(db.BigInteger, nullable=False, default=0)
@@ -1,8 +1,13 @@
 from extensions import db
 from datetime import datetime
+from utils.row_serializer import RowSerializer
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ix_products_name_category', 'name', 'category'),
+        db.Index('ix_products_category_id', 'category', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     model = db.Column(db.String(100))
@@ -22,3 +27,19 @@ class Product(db.Model):
             'price': self.price,
             'description': self.description,
         }
+
+    @classmethod
+    def rows_query(cls):
+        """Column-tuple query for read-only lists; serialize with PRODUCT_ROW."""
+        return db.session.query(*PRODUCT_ROW.columns()).select_from(cls)
+
+
+PRODUCT_ROW = RowSerializer([
+    ('id', Product.id),
+    ('name', Product.name),
+    ('model', Product.model),
+    ('category', Product.category),
+    ('brand', Product.brand),
+    ('price', Product.price),
+    ('description', Product.description),
+])
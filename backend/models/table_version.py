@@ -0,0 +1,32 @@
+from extensions import db
+from datetime import datetime, timezone
+from utils.upsert import upsert_increment
+
+PRODUCTS = 'products'
+FAQS = 'faqs'
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TableVersion(db.Model):
+    """Per-table change stamp, bumped by every write to the table.
+
+    Conditional GETs compare against it instead of reading the table.
+    """
+    __tablename__ = 'table_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)  # UTC
+
+    @classmethod
+    def bump(cls, name):
+        """Stage a version bump in the caller's transaction."""
+        upsert_increment(cls, {'name': name}, {'version': 1}, {'updated_at': _utcnow()})
+
+    @classmethod
+    def stamp(cls, name):
+        """(version, updated_at) for `name`; (0, None) if never written."""
+        row = db.session.query(cls.version, cls.updated_at).filter(cls.name == name).first()
+        return (row.version, row.updated_at) if row else (0, None)
@@ -1,9 +1,21 @@
 from extensions import db
 from datetime import datetime
 from sqlalchemy import func
+from models.product import Product, PRODUCT_ROW
+from utils.row_serializer import RowSerializer
+from utils.product_catalog import product_catalog
 
 class Ticket(db.Model):
     __tablename__ = 'tickets'
+    # Composite (filter, id) indexes serve both the filter and the id-ordered
+    # keyset pagination of the list endpoints.
+    __table_args__ = (
+        db.Index('ix_tickets_customer_id_id', 'customer_id', 'id'),
+        db.Index('ix_tickets_assigned_to_closed_at', 'assigned_to', 'closed_at'),
+        db.Index('ix_tickets_product_id_id', 'product_id', 'id'),
+        db.Index('ix_tickets_status_id', 'status', 'id'),
+        db.Index('ix_tickets_created_at', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.Text)
     status = db.Column(db.String(50), default='Open')
@@ -23,14 +35,8 @@ class Ticket(db.Model):
 
 
     def to_dict(self):
-        # Import here to avoid circular imports
-        from models.product import Product
-        product_data = None
-        if self.product_id:
-            product = Product.query.get(self.product_id)
-            if product:
-                product_data = product.to_dict()
-        
+        product_data = product_catalog.get(self.product_id) if self.product_id else None
+
         return {
             'id': self.id,
             'description': self.description,
@@ -47,6 +53,16 @@ class Ticket(db.Model):
             "pickup_address" : self.pickup_address
         }
     
+    @classmethod
+    def rows_query(cls):
+        """Column-tuple query (tickets LEFT JOIN products) for read-only
+        lists; serialize with TICKET_ROW. One query, no ORM objects."""
+        return (
+            db.session.query(*TICKET_ROW.columns())
+            .select_from(cls)
+            .outerjoin(Product, cls.product_id == Product.id)
+        )
+
     @classmethod
     def average_resolution_time(cls, user_id):
         
@@ -70,3 +86,20 @@ class Ticket(db.Model):
         if total:
             return total  # seconds
         return 0
+
+
+TICKET_ROW = RowSerializer([
+    ('id', Ticket.id),
+    ('description', Ticket.description),
+    ('status', Ticket.status),
+    ('customer_id', Ticket.customer_id),
+    ('product_id', Ticket.product_id),
+    ('product', PRODUCT_ROW),
+    ('assigned_to', Ticket.assigned_to),
+    ('created_at', Ticket.created_at),
+    ('closed_at', Ticket.closed_at),
+    ('pickup_date', Ticket.pickup_date),
+    ('preferred_time_slot', Ticket.preferred_time_slot),
+    ('contact', Ticket.contact),
+    ('pickup_address', Ticket.pickup_address),
+])
@@ -4,9 +4,13 @@ from models.user import User
 from models.product import Product
 from models.ticket import Ticket
 from models.agent_review import Agent_review
+from models.agent_stats import AgentStats
+from models.counter import Counter, TICKETS_TOTAL, TICKETS_CLOSED, PRODUCTS_TOTAL
 from utils.jwt_helper import role_required
+from utils.pagination import paginate, page_response, PaginationError
 from flask_jwt_extended import jwt_required
 from werkzeug.security import generate_password_hash
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 admin_bp = Blueprint('admin', __name__)
@@ -20,8 +24,11 @@ def error_response(message="Something went wrong", status=500):
 @role_required('admin')
 def list_users():
     try:
-        users = User.query.all()
-        return jsonify([u.to_dict() for u in users])
+        filters = {'role': User.role, 'status': User.status}
+        users, next_cursor = paginate(User.query, User.id, filters=filters, date_column=User.created_at)
+        return page_response([u.to_dict() for u in users], next_cursor)
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
 
@@ -31,13 +38,11 @@ def list_users():
 @role_required('admin')
 def stats():
     try:
-        total_tickets = Ticket.query.count()
-        resolved = Ticket.query.filter(Ticket.status == 'Closed').count()
-        products = Product.query.count()
+        counts = Counter.get_many([TICKETS_TOTAL, TICKETS_CLOSED, PRODUCTS_TOTAL])
         return jsonify({
-            'total_tickets': total_tickets,
-            'resolved': resolved,
-            'products': products
+            'total_tickets': counts[TICKETS_TOTAL],
+            'resolved': counts[TICKETS_CLOSED],
+            'products': counts[PRODUCTS_TOTAL]
         })
     except Exception as e:
         return error_response(str(e))
@@ -138,23 +143,41 @@ def edit_agent():
 @jwt_required()
 @role_required('admin')
 def admin_dashbroad():
+    """Per-agent stats from the agent_stats rollup (one query).
+
+    ?source=live recomputes the numbers from tickets and reviews with a
+    single GROUP BY query instead.
+    """
     try:
         result = []
 
-        for user in User.query.all():
-            u = user.to_dict()
-
-            if u['role'] == 'internal':
-                d = {
-                    'agent_id': u['name'],
-                    'specialization': u['specialization'],
-                    'ticket_resolved': Ticket.total_resolved(u['id']),
-                    'avg_time': Ticket.average_resolution_time(u['id']),
-                    'rating': Agent_review.avg_rating(u['id']),
-                    'feedback': Agent_review.no_feedback(u['id']),
-                    'status': u['status']
-                }
-                result.append(d)
+        if request.args.get('source') == 'live':
+            agents = User.query.filter(User.role == 'internal').order_by(User.id).all()
+            totals = AgentStats.live_totals()
+            rows = [(user, *totals.get(user.id, (0, 0.0, 0, 0))) for user in agents]
+        else:
+            rows = (
+                db.session.query(
+                    User,
+                    func.coalesce(AgentStats.resolved_count, 0),
+                    func.coalesce(AgentStats.resolution_seconds, 0.0),
+                    func.coalesce(AgentStats.review_count, 0),
+                    func.coalesce(AgentStats.rating_sum, 0),
+                )
+                .outerjoin(AgentStats, AgentStats.user_id == User.id)
+                .filter(User.role == 'internal')
+                .order_by(User.id)
+                .all()
+            )
+
+        for user, *totals in rows:
+            d = {
+                'agent_id': user.name,
+                'specialization': user.specialization,
+                **AgentStats.dashboard_fields(*totals),
+                'status': user.status
+            }
+            result.append(d)
 
         return jsonify(result)
 
@@ -167,9 +190,12 @@ def admin_dashbroad():
 @role_required('admin')
 def customer_feedback():
     try:
-        feedback = Agent_review.query.all()
-        return jsonify([i.to_dict() for i in feedback])
+        filters = {'user_id': Agent_review.user_id, 'ticket_id': Agent_review.ticket_id}
+        feedback, next_cursor = paginate(Agent_review.query, Agent_review.id, filters=filters)
+        return page_response([i.to_dict() for i in feedback], next_cursor)
 
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
         
\ No newline at end of file
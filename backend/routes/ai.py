@@ -1,10 +1,50 @@
-from flask import Blueprint, request, jsonify
-from utils.ai_client import ask_ai_faq
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from utils.ai_client import ask_ai_faq, ask_ai_faq_stream, AIUnavailableError, breaker, prompt_builder
+from utils.response_cache import chat_cache, normalize_query
+from utils.singleflight import chat_flight
+from utils.faq_memory import sync_faq_memory, faq_version
+from utils.intent_matcher import fallback_matcher
+from utils.jwt_helper import role_required
 from flask_jwt_extended import jwt_required
 from models.faq import Faq
+from models.table_version import FAQS
+from utils.conditional import conditional_get
 
 ai_bp = Blueprint('ai', __name__)
 
+# Limits for /chat/batch
+AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "200"))
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+
+
+@ai_bp.before_request
+def refresh_faqs():
+    # Throttled; picks up FAQ writes made by any worker
+    if sync_faq_memory():
+        chat_cache.clear()
+
+
+def cached_ask(message):
+    """ask_ai_faq behind the normalized-query response cache.
+
+    Concurrent misses for the same normalized query share one upstream call.
+    """
+    key = normalize_query(message)
+    resp = chat_cache.get(key)
+    if resp is not None:
+        return resp
+
+    def fetch():
+        answer = ask_ai_faq(message)
+        chat_cache.set(key, answer)
+        return answer
+
+    return chat_flight.do(key, fetch)
+
 
 #-------------------------  AI CHAT   --------------------------
 @ai_bp.route('/chat', methods=['POST'])
@@ -22,7 +62,10 @@ def chat():
 
         # AI FAQ call
         try:
-            resp = ask_ai_faq(message)
+            resp = cached_ask(message)
+        except AIUnavailableError:
+            # Provider down or breaker open: answer from the keyword rules
+            return jsonify({"response": get_fallback_response(message.lower()), "fallback": True})
         except Exception as ai_err:
             return jsonify({"error": f"AI processing failed: {str(ai_err)}"}), 500
 
@@ -33,6 +76,122 @@ def chat():
         return jsonify({"error": "Something went wrong", "details": str(e)}), 500
 
 
+def answer_one(message):
+    """Answer a single batch item; never raises."""
+    started = time.monotonic()
+    item = {}
+    try:
+        item["response"] = cached_ask(message)
+    except AIUnavailableError:
+        item["response"] = get_fallback_response(message.lower())
+        item["fallback"] = True
+    except Exception as ai_err:
+        item["error"] = f"AI processing failed: {str(ai_err)}"
+    item["latency_ms"] = round((time.monotonic() - started) * 1000, 2)
+    return item
+
+
+#-------------------------  AI CHAT BATCH   --------------------------
+@ai_bp.route('/chat/batch', methods=['POST'])
+@jwt_required()
+def chat_batch():
+    """Answer a list of queries in one request.
+
+    Duplicate queries (after normalization) are answered once, and at most
+    AI_BATCH_CONCURRENCY provider calls run at a time. Results come back in
+    input order.
+    """
+    try:
+        data = request.json or {}
+        queries = data.get('queries')
+
+        if not isinstance(queries, list) or not queries:
+            return jsonify({"error": "queries must be a non-empty list"}), 400
+        if len(queries) > AI_BATCH_MAX_ITEMS:
+            return jsonify({"error": f"at most {AI_BATCH_MAX_ITEMS} queries per batch"}), 400
+
+        unique = {}
+        for q in queries:
+            if isinstance(q, str) and q.strip():
+                unique.setdefault(normalize_query(q), q)
+
+        started = time.monotonic()
+        answers = {}
+        if unique:
+            with ThreadPoolExecutor(max_workers=min(AI_BATCH_CONCURRENCY, len(unique))) as pool:
+                answers = dict(zip(unique, pool.map(answer_one, unique.values())))
+
+        results = []
+        for q in queries:
+            if not isinstance(q, str) or not q.strip():
+                results.append({"query": q, "error": "query is required"})
+            else:
+                results.append({"query": q, **answers[normalize_query(q)]})
+
+        return jsonify({
+            "results": results,
+            "unique_queries": len(unique),
+            "total_ms": round((time.monotonic() - started) * 1000, 2),
+        })
+
+    except Exception as e:
+        return jsonify({"error": "Something went wrong", "details": str(e)}), 500
+
+
+def sse_event(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+#-------------------------  AI CHAT STREAM   --------------------------
+@ai_bp.route('/chat/stream', methods=['POST'])
+@jwt_required()
+def chat_stream():
+    """Stream the answer as Server-Sent Events.
+
+    Each token is sent as `data: {"token": ...}`; the stream always ends
+    with either an `event: done` or an `event: error` message.
+    """
+    data = request.json or {}
+    message = data.get('query')
+
+    if not message:
+        return jsonify({"error": "query is required"}), 400
+
+    def generate():
+        key = normalize_query(message)
+        cached = chat_cache.get(key)
+        if cached is not None:
+            yield sse_event({"token": cached})
+            yield sse_event({"cached": True}, event="done")
+            return
+
+        parts = []
+        try:
+            for token in ask_ai_faq_stream(message):
+                parts.append(token)
+                yield sse_event({"token": token})
+        except AIUnavailableError:
+            if not parts:
+                yield sse_event({"token": get_fallback_response(message.lower())})
+                yield sse_event({"cached": False, "fallback": True}, event="done")
+                return
+            yield sse_event({"error": "AI provider unavailable"}, event="error")
+            return
+        except Exception as ai_err:
+            yield sse_event({"error": f"AI processing failed: {str(ai_err)}"}, event="error")
+            return
+
+        chat_cache.set(key, "".join(parts))
+        yield sse_event({"cached": False}, event="done")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 #-------------------------  AI CHAT TEST   --------------------------
 @ai_bp.route('/chat_test', methods=['POST'])
 def chat_test():
@@ -48,7 +207,7 @@ def chat_test():
 
         # Try AI FAQ call, fallback to simple response if it fails
         try:
-            resp = ask_ai_faq(message)
+            resp = cached_ask(message)
             print(f"AI response: {resp}")
             return jsonify(resp)
         except Exception as ai_err:
@@ -63,30 +222,23 @@ def chat_test():
 
 def get_fallback_response(message):
     """Provide fallback responses when AI is not available"""
-    if any(word in message for word in ['hello', 'hi', 'hey']):
-        return "Hello! I'm here to help with your technical support questions. How can I assist you today?"
-    
-    elif any(word in message for word in ['battery', 'charging']):
-        return "For battery and charging issues, please check if the charging cable is properly connected. Try using a different charger if available. If the issue persists, you can create a support ticket for further assistance."
-    
-    elif any(word in message for word in ['screen', 'display']):
-        return "For screen or display issues, try restarting your device first. Check if the issue occurs in different apps or only specific ones. If the problem continues, please create a support ticket with details about when the issue started."
-    
-    elif any(word in message for word in ['slow', 'performance']):
-        return "For performance issues, try closing unused apps and restarting your device. Check available storage space. If your device continues to be slow, consider creating a support ticket for hardware diagnosis."
-    
-    elif any(word in message for word in ['ticket', 'support', 'help']):
-        return "You can create a support ticket by clicking 'Create New Ticket' on the dashboard. This will help us track and resolve your issue efficiently. Our support team typically responds within 24 hours."
-    
-    elif any(word in message for word in ['warranty', 'repair']):
-        return "For warranty and repair information, please check your device's warranty status in your account. Most repairs are covered under standard warranty for the first year. You can schedule a pickup for diagnosis through our support system."
-    
-    else:
-        return "I understand you need help with your device. For the best assistance, I recommend creating a support ticket with specific details about your issue. Our technical team can provide personalized solutions for your problem."
+    return fallback_matcher.respond(message)
+
+
+#-------------------------  AI STATS   --------------------------
+@ai_bp.route('/stats', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def ai_stats():
+    return jsonify({"cache": chat_cache.stats(), "breaker": breaker.stats(),
+                    "singleflight": chat_flight.stats(),
+                    "prompt": prompt_builder.stats(),
+                    "faq_version": faq_version()})
 
 
 #-------------------------  GET ALL FAQ   --------------------------
 @ai_bp.route('/faq/get_all_faq', methods=['GET'])
+@conditional_get(FAQS)
 def get_all_faq():
     """Get all FAQs without authentication"""
     try:
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify
 from extensions import db
-from models.component_order import ComponentOrder
+from models.component_order import ComponentOrder, ORDER_ROW
 from models.ticket import Ticket
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from utils.jwt_helper import role_required
+from utils.pagination import paginate, page_response, apply_filters, PaginationError
+from utils.streaming import wants_ndjson, ndjson_response
+from utils.bulk_update import bulk_selection, update_returning_ids, BulkUpdateError
+from utils.id_allocator import order_ids
 from datetime import datetime
+from sqlalchemy import func, or_
 from sqlalchemy.exc import SQLAlchemyError
-import random
 
 orders_bp = Blueprint('orders', __name__)
 
@@ -22,13 +26,27 @@ def list_user_orders():
         uid = get_jwt_identity()
         role = claims.get('role')
 
+        filters = {
+            'status': ComponentOrder.status,
+            'ticket_id': ComponentOrder.ticket_id,
+            'device_type': ComponentOrder.device_type,
+        }
+        query = ComponentOrder.rows_query()
         if role in ['admin', 'internal']:
-            orders = ComponentOrder.query.all()
+            filters['customer_id'] = ComponentOrder.customer_id
         else:
-            orders = ComponentOrder.query.filter_by(customer_id=uid).all()
+            query = query.filter(ComponentOrder.customer_id == uid)
+
+        if wants_ndjson():
+            query = apply_filters(query, filters, date_column=ComponentOrder.created_at)
+            return ndjson_response(query, ComponentOrder.id, ORDER_ROW)
 
-        return jsonify([order.to_dict() for order in orders])
+        orders, next_cursor = paginate(query, ComponentOrder.id, filters=filters,
+                                       date_column=ComponentOrder.created_at)
+        return page_response([ORDER_ROW(order) for order in orders], next_cursor)
 
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
 
@@ -38,7 +56,7 @@ def test_orders():
     """Test endpoint to return orders without authentication"""
     try:
         # Get all orders from database
-        orders = ComponentOrder.query.all()
+        orders = ComponentOrder.rows_query().all()
         
         # If no orders in database, return mock data
         if not orders:
@@ -65,7 +83,7 @@ def test_orders():
             return jsonify(mock_orders)
         
         # Return actual orders from database
-        return jsonify([order.to_dict() for order in orders])
+        return jsonify([ORDER_ROW(order) for order in orders])
 
     except Exception as e:
         return error_response(str(e))
@@ -85,7 +103,7 @@ def create_order():
             return error_response("component_name is required", 400)
 
         # Generate order ID
-        order_id = f"P-{random.randint(1000, 9999)}"
+        order_id = order_ids.next_id()
 
         # Component pricing (mock pricing)
         component_prices = {
@@ -139,7 +157,7 @@ def test_create_order():
         customer_id = 1  # Default test customer
 
         # Generate order ID
-        order_id = f"P-{random.randint(1000, 9999)}"
+        order_id = order_ids.next_id()
 
         # Component pricing (mock pricing)
         component_prices = {
@@ -215,4 +233,51 @@ def update_order_status(id):
         db.session.rollback()
         return error_response(str(db_err))
     except Exception as e:
-        return error_response(str(e))
\ No newline at end of file
+        return error_response(str(e))
+
+
+@orders_bp.route('/bulk_status', methods=['PUT'])
+@jwt_required()
+@role_required('internal', 'admin')
+def bulk_update_order_status():
+    """Set the status of many orders in one set-based UPDATE.
+
+    Body: {"status": ..., "ids": [...]} and/or "filter": {...}. Shipped and
+    Delivered stamp shipped_at / delivered_at where still empty, as the
+    single-order endpoint does. Returns the ids of the orders changed.
+    """
+    try:
+        data = request.json or {}
+        status = data.get("status")
+        if not status:
+            return error_response("status is required", 400)
+
+        filters = {
+            'status': ComponentOrder.status,
+            'customer_id': ComponentOrder.customer_id,
+            'ticket_id': ComponentOrder.ticket_id,
+            'device_type': ComponentOrder.device_type,
+        }
+        conditions = bulk_selection(ComponentOrder, filters, data)
+
+        now = datetime.utcnow()
+        values = {'status': status}
+        changed = [ComponentOrder.status.is_distinct_from(status)]
+        if status == "Shipped":
+            values['shipped_at'] = func.coalesce(ComponentOrder.shipped_at, now)
+            changed.append(ComponentOrder.shipped_at.is_(None))
+        elif status == "Delivered":
+            values['delivered_at'] = func.coalesce(ComponentOrder.delivered_at, now)
+            changed.append(ComponentOrder.delivered_at.is_(None))
+
+        ids = update_returning_ids(ComponentOrder, conditions + [or_(*changed)], values)
+        db.session.commit()
+        return jsonify({'updated': len(ids), 'ids': sorted(ids)})
+
+    except (BulkUpdateError, PaginationError) as e:
+        return error_response(str(e), 400)
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return error_response(str(db_err))
+    except Exception as e:
+        return error_response(str(e))
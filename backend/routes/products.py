@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
 from extensions import db
 from models.product import Product
+from models.counter import Counter, PRODUCTS_TOTAL
+from models.table_version import TableVersion, PRODUCTS
+from utils.conditional import conditional_get, validated_version
 from utils.jwt_helper import role_required
+from utils.pagination import page_response, page_limit, encode_cursor, decode_cursor, PaginationError
+from utils.product_catalog import product_catalog
 from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -12,22 +17,41 @@ def error_response(message="Something went wrong", status=500):
 
 #-------------------------  LIST PRODUCT   --------------------------
 @products_bp.route('/list_product', methods=['GET'])
+@conditional_get(PRODUCTS)
 def list_products():
     try:
-        items = Product.query.all()
-        return jsonify([p.to_dict() for p in items])
+        cursor = request.args.get('cursor')
+        items, has_more = product_catalog.page(
+            decode_cursor(cursor) if cursor else None,
+            page_limit(),
+            version=validated_version(),
+            category=request.args.get('category'),
+            brand=request.args.get('brand'),
+        )
+        next_cursor = encode_cursor(items[-1]['id']) if has_more else None
+        return page_response(items, next_cursor)
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
 
 
+#-------------------------  CATALOG CACHE STATS   --------------------------
+@products_bp.route('/cache_stats', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def catalog_cache_stats():
+    return jsonify(product_catalog.stats())
+
+
 #-------------------------  GET PRODUCT   --------------------------
 @products_bp.route('/get/<int:id>', methods=['GET'])
 def get_product(id):
     try:
-        p = Product.query.get(id)
+        p = product_catalog.get(id)
         if not p:
             return error_response("Product not found", 404)
-        return jsonify(p.to_dict())
+        return jsonify(p)
     except Exception as e:
         return error_response(str(e))
 
@@ -55,7 +79,10 @@ def add_product():
         )
 
         db.session.add(p)
+        Counter.add(PRODUCTS_TOTAL, 1)
+        TableVersion.bump(PRODUCTS)
         db.session.commit()
+        product_catalog.put(p.to_dict())
 
         return jsonify({'product': p.to_dict()}), 201
 
@@ -81,7 +108,9 @@ def update_product(id):
         p.model = data.get('model', p.model)
         p.description = data.get('description', p.description)
 
+        TableVersion.bump(PRODUCTS)
         db.session.commit()
+        product_catalog.put(p.to_dict())
 
         return jsonify({'product': p.to_dict()})
 
@@ -102,7 +131,10 @@ def delete_product(id):
             return error_response("Product not found", 404)
 
         db.session.delete(p)
+        Counter.add(PRODUCTS_TOTAL, -1)
+        TableVersion.bump(PRODUCTS)
         db.session.commit()
+        product_catalog.remove(id)
 
         return jsonify({'message': 'deleted'})
 
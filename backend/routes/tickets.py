@@ -1,11 +1,25 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from extensions import db
-from models.ticket import Ticket
+from models.ticket import Ticket, TICKET_ROW
 from models.product import Product
 from models.faq import Faq
+from models.faq_change import FaqChange
+from models.table_version import FAQS
 from models.agent_review import Agent_review
+from models.agent_stats import AgentStats
+from models.counter import Counter, TICKETS_TOTAL, TICKETS_CLOSED
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from utils.jwt_helper import role_required
+from utils.response_cache import chat_cache
+from utils.faq_memory import sync_faq_memory
+from utils.pagination import (paginate, page_response, page_limit, apply_filters, encode_cursor,
+                              decode_cursor_fields, PaginationError)
+from utils.ticket_search import search_query, search_page, SearchError
+from utils.ticket_import import read_upload, import_tickets, TicketImportError
+from utils.bulk_update import bulk_selection, update_returning_ids, BulkUpdateError
+from utils.streaming import wants_ndjson, ndjson_response
+from utils.conditional import conditional_get
+from utils.product_catalog import product_catalog
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -15,6 +29,12 @@ def error_response(message="Something went wrong", status=500):
     return jsonify({"error": message}), status
 
 
+def count_status_change(old, new):
+    """Keep the closed-ticket counter in step with a status change."""
+    if old != new and 'Closed' in (old, new):
+        Counter.add(TICKETS_CLOSED, 1 if new == 'Closed' else -1)
+
+
 @tickets_bp.route('/get_all_ticket', methods=['GET'])
 @jwt_required()
 def list_user_tickets():
@@ -23,13 +43,26 @@ def list_user_tickets():
         uid = get_jwt_identity()
         role = claims.get('role')
 
+        filters = {
+            'status': Ticket.status,
+            'assigned_to': Ticket.assigned_to,
+            'product_id': Ticket.product_id,
+        }
+        query = Ticket.rows_query()
         if role in ['admin', 'internal']:
-            items = Ticket.query.all()
+            filters['customer_id'] = Ticket.customer_id
         else:
-            items = Ticket.query.filter_by(customer_id=uid).all()
+            query = query.filter(Ticket.customer_id == uid)
+
+        if wants_ndjson():
+            query = apply_filters(query, filters, date_column=Ticket.created_at)
+            return ndjson_response(query, Ticket.id, TICKET_ROW)
 
-        return jsonify([t.to_dict() for t in items])
+        items, next_cursor = paginate(query, Ticket.id, filters=filters, date_column=Ticket.created_at)
+        return page_response([TICKET_ROW(t) for t in items], next_cursor)
 
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
 
@@ -39,7 +72,7 @@ def test_tickets():
     """Test endpoint to return tickets without authentication"""
     try:
         # Get all tickets from database
-        tickets = Ticket.query.all()
+        tickets = Ticket.rows_query().all()
         
         # If no tickets in database, return mock data
         if not tickets:
@@ -82,7 +115,7 @@ def test_tickets():
             return jsonify(mock_tickets)
         
         # Return actual tickets from database
-        return jsonify([ticket.to_dict() for ticket in tickets])
+        return jsonify([TICKET_ROW(ticket) for ticket in tickets])
 
     except Exception as e:
         return error_response(str(e))
@@ -104,24 +137,15 @@ def test_create_ticket():
         # Find product by name and category
         product = None
         if data.get("product_category") and data.get("device_model"):
-            from models.product import Product
             category = data.get("product_category")
             device_model = data.get("device_model")
-            
-            print(f"Looking for product: category='{category}', name='{device_model}'")
-            
-            product = Product.query.filter_by(
-                name=device_model,
-                category=category
-            ).first()
-            
+
+            product, match, score = product_catalog.resolve(device_model, category)
+
             if product:
-                print(f"Found product: {product.name} (ID: {product.id})")
+                print(f"Found product: {product['name']} (ID: {product['id']}, {match} match, score {score:.2f})")
             else:
-                print(f"No product found. Available products:")
-                all_products = Product.query.all()
-                for p in all_products:
-                    print(f"  - {p.name} ({p.category})")
+                print(f"No product found: category='{category}', name='{device_model}' (best score {score:.2f})")
         else:
             print(f"Missing product data: category={data.get('product_category')}, model={data.get('device_model')}")
 
@@ -135,7 +159,7 @@ def test_create_ticket():
             description=data.get("description"),
             status=data.get("status", "Not Picked"),
             customer_id=customer_id,
-            product_id=product.id if product else None,
+            product_id=product['id'] if product else None,
             pickup_date=pickup,
             preferred_time_slot=data.get("preferred_time_slot"),
             contact=data.get("contact"),
@@ -143,6 +167,8 @@ def test_create_ticket():
         )
 
         db.session.add(ticket)
+        Counter.add(TICKETS_TOTAL, 1)
+        count_status_change(None, ticket.status)
         db.session.commit()
 
         return jsonify({'ticket': ticket.to_dict()}), 201
@@ -189,6 +215,8 @@ def create_ticket():
         )
 
         db.session.add(ticket)
+        Counter.add(TICKETS_TOTAL, 1)
+        count_status_change(None, ticket.status)
         db.session.commit()
 
         return jsonify({'ticket': ticket.to_dict()}), 201
@@ -201,6 +229,81 @@ def create_ticket():
 
 
 
+# ------------------ BULK IMPORT TICKETS ------------------
+@tickets_bp.route('/import', methods=['POST'])
+@jwt_required()
+@role_required('internal', 'admin')
+def import_tickets_bulk():
+    """Import many tickets from a JSON array or NDJSON body.
+
+    Rows are validated up front and inserted in batches of ?batch_size=
+    (default TICKET_IMPORT_BATCH_SIZE); invalid rows are skipped and listed
+    in the report with their 0-based row number. Each batch commits on its
+    own: if the import fails part way it answers 500 with the report of
+    what was committed and `resume_from_row`, the first row to resend.
+    """
+    try:
+        default = current_app.config.get("TICKET_IMPORT_BATCH_SIZE", 1000)
+        try:
+            batch_size = int(request.args.get('batch_size', default))
+        except ValueError:
+            return error_response("batch_size must be an integer", 400)
+        if batch_size < 1:
+            return error_response("batch_size must be positive", 400)
+
+        report = import_tickets(read_upload(), batch_size)
+        return jsonify(report), 500 if 'error' in report else 200
+
+    except TicketImportError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        db.session.rollback()
+        return error_response(str(e))
+
+
+# ------------------ SEARCH TICKETS ------------------
+@tickets_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_tickets():
+    """Full-text search over descriptions, best match first.
+
+    ?q=words (all must match, or any with ?match=any), plus the same
+    filters and cursor/limit paging as get_all_ticket.
+    """
+    try:
+        claims = get_jwt()
+        uid = get_jwt_identity()
+        role = claims.get('role')
+
+        query, score = search_query(request.args.get('q'), request.args.get('match') == 'any')
+
+        filters = {
+            'status': Ticket.status,
+            'assigned_to': Ticket.assigned_to,
+            'product_id': Ticket.product_id,
+        }
+        if role in ['admin', 'internal']:
+            filters['customer_id'] = Ticket.customer_id
+        else:
+            query = query.filter(Ticket.customer_id == uid)
+        query = apply_filters(query, filters, date_column=Ticket.created_at)
+
+        cursor = request.args.get('cursor')
+        after = None
+        if cursor:
+            last_id, last_score = decode_cursor_fields(cursor, 'score')
+            after = (last_score, last_id)
+
+        rows, next_key = search_page(query, score, after, page_limit())
+        next_cursor = encode_cursor(next_key[1], score=next_key[0]) if next_key else None
+        return page_response([TICKET_ROW(r) for r in rows], next_cursor)
+
+    except (SearchError, PaginationError) as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+
+
 # ------------------ GET SINGLE TICKET ------------------
 @tickets_bp.route('/get_ticket/<int:id>', methods=['GET'])
 @jwt_required()
@@ -227,7 +330,9 @@ def update_status(id):
             return error_response("Ticket not found", 404)
 
         data = request.json or {}
+        old_status = t.status
         t.status = data.get("status", t.status)
+        count_status_change(old_status, t.status)
 
         db.session.commit()
         return jsonify({'ticket': t.to_dict()})
@@ -239,6 +344,53 @@ def update_status(id):
         return error_response(str(e))
 
 
+# ------------------ BULK UPDATE STATUS ------------------
+@tickets_bp.route('/bulk_status', methods=['PUT'])
+@jwt_required()
+@role_required('internal', 'admin')
+def bulk_update_status():
+    """Set the status of many tickets with set-based UPDATEs.
+
+    Body: {"status": ..., "ids": [...]} and/or "filter": {...}. Only
+    tickets whose status actually changes are written; their ids are
+    returned. Rows leaving or entering Closed adjust the closed counter
+    by exactly the number RETURNING reports.
+    """
+    try:
+        data = request.json or {}
+        status = data.get("status")
+        if not status:
+            return error_response("status is required", 400)
+
+        filters = {
+            'status': Ticket.status,
+            'customer_id': Ticket.customer_id,
+            'assigned_to': Ticket.assigned_to,
+            'product_id': Ticket.product_id,
+        }
+        conditions = bulk_selection(Ticket, filters, data)
+
+        ids = []
+        if status != 'Closed':
+            ids = update_returning_ids(Ticket, conditions + [Ticket.status == 'Closed'], {'status': status})
+            Counter.add(TICKETS_CLOSED, -len(ids))
+        changed = update_returning_ids(Ticket, conditions + [Ticket.status.is_distinct_from(status)],
+                                       {'status': status})
+        if status == 'Closed':
+            Counter.add(TICKETS_CLOSED, len(changed))
+        ids += changed
+
+        db.session.commit()
+        return jsonify({'updated': len(ids), 'ids': sorted(ids)})
+
+    except (BulkUpdateError, PaginationError) as e:
+        return error_response(str(e), 400)
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return error_response(str(db_err))
+    except Exception as e:
+        return error_response(str(e))
+
 
 # ------------------ CLOSE TICKET ------------------
 @tickets_bp.route('/<int:id>/close', methods=['PUT'])
@@ -254,8 +406,12 @@ def close_ticket(id):
         if t.customer_id != uid:
             return error_response("not allowed", 403)
 
+        newly_closed = t.closed_at is None
+        count_status_change(t.status, "Closed")
         t.status = "Closed"
         t.closed_at = datetime.utcnow()
+        if newly_closed and t.assigned_to:
+            AgentStats.record_resolution(t.assigned_to, t.created_at, t.closed_at)
         db.session.commit()
 
         return jsonify({'ticket': t.to_dict()})
@@ -273,8 +429,8 @@ def close_ticket(id):
 @jwt_required()
 def history(productId):
     try:
-        tickets = Ticket.query.filter_by(product_id=productId).all()
-        return jsonify([t.to_dict() for t in tickets])
+        tickets = Ticket.rows_query().filter(Ticket.product_id == productId).all()
+        return jsonify([TICKET_ROW(t) for t in tickets])
     except Exception as e:
         return error_response(str(e))
 
@@ -299,6 +455,8 @@ def review():
         )
 
         db.session.add(r)
+        if r.user_id:
+            AgentStats.record_review(r.user_id, r.rating)
         db.session.commit()
 
         return jsonify({"message": "successfully added"})
@@ -310,6 +468,13 @@ def review():
         return error_response(str(e))
 
 
+def refresh_faq_memory():
+    # Pull our own write in now; other workers pick it up on their next sync
+    sync_faq_memory(force=True)
+    # Cached chat answers may contradict the changed FAQ
+    chat_cache.clear()
+
+
 # ------------------ ADD FAQ ------------------
 @tickets_bp.route('/add_faq', methods=['POST'])
 @jwt_required()
@@ -324,8 +489,12 @@ def add_faq():
         faq = Faq(question=data.get("question"), answer=data.get("answer"))
 
         db.session.add(faq)
+        db.session.flush()
+        FaqChange.record(faq.id, 'add')
         db.session.commit()
 
+        refresh_faq_memory()
+
         return jsonify({"message": "successfully added"})
 
     except SQLAlchemyError as db_err:
@@ -335,13 +504,69 @@ def add_faq():
         return error_response(str(e))
 
 
+# ------------------ UPDATE FAQ ------------------
+@tickets_bp.route('/faq/<int:id>', methods=['PUT'])
+@jwt_required()
+@role_required('internal', 'admin')
+def update_faq(id):
+    try:
+        faq = Faq.query.get(id)
+        if not faq:
+            return error_response("FAQ not found", 404)
+
+        data = request.json or {}
+        faq.question = data.get("question", faq.question)
+        faq.answer = data.get("answer", faq.answer)
+
+        FaqChange.record(faq.id, 'edit')
+        db.session.commit()
+
+        refresh_faq_memory()
+
+        return jsonify({"faq": faq.to_dict()})
+
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return error_response(str(db_err))
+    except Exception as e:
+        return error_response(str(e))
+
+
+# ------------------ DELETE FAQ ------------------
+@tickets_bp.route('/faq/<int:id>', methods=['DELETE'])
+@jwt_required()
+@role_required('internal', 'admin')
+def delete_faq(id):
+    try:
+        faq = Faq.query.get(id)
+        if not faq:
+            return error_response("FAQ not found", 404)
+
+        db.session.delete(faq)
+        FaqChange.record(id, 'delete')
+        db.session.commit()
+
+        refresh_faq_memory()
+
+        return jsonify({"message": "deleted"})
+
+    except SQLAlchemyError as db_err:
+        db.session.rollback()
+        return error_response(str(db_err))
+    except Exception as e:
+        return error_response(str(e))
+
+
 # ------------------ GET FAQ ------------------
 @tickets_bp.route('/get_faq', methods=['GET'])
 @jwt_required()
+@conditional_get(FAQS, private=True)
 def get_faq():
     try:
-        faqs = Faq.query.all()
-        return jsonify([f.to_dict() for f in faqs])
+        faqs, next_cursor = paginate(Faq.query, Faq.id, descending=False)
+        return page_response([f.to_dict() for f in faqs], next_cursor)
+    except PaginationError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(str(e))
 
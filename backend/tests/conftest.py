@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The default OpenRouter provider refuses to start without a key
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+from config import Config
+
+
+class TestConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    TESTING = True
+    JWT_SECRET_KEY = "test-jwt-secret-0123456789abcdef0123"
+    AI_PROVIDER = "fake"
+    PAGE_SIZE_MAX = 1000
+
+
+CUSTOMER_ID = 1
+AGENT_ID = 2
+
+
+@pytest.fixture
+def app():
+    from app import create_app
+    from extensions import db
+    from models.user import User
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.session.add(User(id=CUSTOMER_ID, email="customer@example.com", name="Customer", role="customer"))
+        db.session.add(User(id=AGENT_ID, email="agent@example.com", name="Agent", role="internal"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_headers(role="admin", user_id=AGENT_ID):
+    from flask_jwt_extended import create_access_token
+
+    token = create_access_token(identity=str(user_id), additional_claims={"role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def queries(app):
+    """List of SQL statements executed while the test runs; clear() it
+    before the request being measured."""
+    from extensions import db
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", record)
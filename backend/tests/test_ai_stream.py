@@ -0,0 +1,96 @@
+"""/api/ai/chat/stream sends each token as an SSE data event and always ends
+with exactly one `done` or `error` event."""
+import json
+
+import pytest
+
+import utils.ai_client as ai_client
+from conftest import CUSTOMER_ID, auth_headers
+from utils.circuit_breaker import CircuitBreaker
+from utils.intent_matcher import fallback_matcher
+from utils.response_cache import chat_cache, normalize_query
+
+URL = "/api/ai/chat/stream"
+QUERY = "my laptop battery drains overnight"
+
+
+class ChunkProvider:
+    """Yields `chunks`, then raises `error` if one is given."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.calls = 0
+
+    def complete(self, system_prompt, stream=False, timeout=None):
+        self.calls += 1
+        return self._chunks()
+
+    def _chunks(self):
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker(app, monkeypatch):
+    chat_cache.clear()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(ai_client, "breaker", breaker)
+    yield breaker
+    chat_cache.clear()
+
+
+def stream(client, provider, monkeypatch):
+    monkeypatch.setattr(ai_client, "provider", provider)
+    resp = client.post(URL, json={"query": QUERY}, headers=auth_headers("customer", CUSTOMER_ID))
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    events = []
+    for block in resp.get_data(as_text=True).split("\n\n"):
+        if not block:
+            continue
+        event, data = "message", None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+def test_tokens_in_order_then_done(client, monkeypatch, fresh_breaker):
+    chunks = ["Try ", "a full ", "battery calibration."]
+    events = stream(client, ChunkProvider(chunks), monkeypatch)
+
+    assert events == [("message", {"token": c}) for c in chunks] + [("done", {"cached": False})]
+    assert fresh_breaker.stats()["total_calls"] == 1
+    assert fresh_breaker.stats()["total_failures"] == 0
+
+
+def test_mid_stream_exception_ends_with_error_event(client, monkeypatch, fresh_breaker):
+    provider = ChunkProvider(["Try ", "a full "], error=RuntimeError("connection reset"))
+    events = stream(client, provider, monkeypatch)
+
+    assert events[:2] == [("message", {"token": "Try "}), ("message", {"token": "a full "})]
+    assert len(events) == 3
+    event, data = events[2]
+    assert event == "error"
+    assert "connection reset" in data["error"]
+    assert fresh_breaker.stats()["total_failures"] == 1
+    # A failed stream is not cached as an answer
+    assert chat_cache.get(normalize_query(QUERY)) is None
+
+
+def test_open_breaker_streams_fallback(client, monkeypatch, fresh_breaker):
+    fresh_breaker.record(0.0, ok=False)
+    assert fresh_breaker.state == "open"
+    provider = ChunkProvider(["never sent"])
+    events = stream(client, provider, monkeypatch)
+
+    assert events == [
+        ("message", {"token": fallback_matcher.respond(QUERY.lower())}),
+        ("done", {"cached": False, "fallback": True}),
+    ]
+    assert provider.calls == 0
@@ -0,0 +1,56 @@
+import pytest
+
+from utils.intent_matcher import DEFAULT_RESPONSE, IntentMatcher, fallback_matcher
+
+
+def rule(name, priority, *keywords):
+    return {"name": name, "priority": priority, "keywords": list(keywords), "response": name}
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("Hi!", "greeting"),
+    ("That was helpful, thanks", "ticket"),
+    ("my touchscreen is dead", "display"),
+    ("it's recharging slowly", "battery"),
+    ("the battery-life is bad and the screen too", "battery"),
+    ("this thing, which one", None),   # "hi" only inside words
+    ("chargers", None),
+    ("", None),
+    (None, None),
+])
+def test_shipped_rules(message, expected):
+    intent = fallback_matcher.classify(message)
+    assert (intent and intent["name"]) == expected
+
+
+def test_highest_priority_hit_wins_regardless_of_position():
+    matcher = IntentMatcher([rule("low", 1, "screen"), rule("high", 9, "battery")])
+    assert matcher.classify("screen and battery")["name"] == "high"
+
+
+def test_phrase_words_may_be_separated_by_any_non_word_characters():
+    matcher = IntentMatcher([rule("door", 1, "screen door")])
+    assert matcher.classify("the screen-door is stuck")["name"] == "door"
+    assert matcher.classify("the screen  door")["name"] == "door"
+    assert matcher.classify("the screendoor") is None
+
+
+@pytest.mark.parametrize("word_priority,phrase_priority,expected", [(9, 1, "word"), (1, 9, "phrase")])
+def test_keyword_and_phrase_sharing_a_prefix(word_priority, phrase_priority, expected):
+    matcher = IntentMatcher([rule("word", word_priority, "dead"), rule("phrase", phrase_priority, "dead battery")])
+    assert matcher.classify("dead battery")["name"] == expected
+    assert matcher.classify("so dead")["name"] == "word"
+
+
+def test_phrase_does_not_hide_a_higher_priority_word_inside_it():
+    matcher = IntentMatcher([rule("battery", 9, "battery"), rule("dead", 1, "dead battery")])
+    assert matcher.classify("dead battery")["name"] == "battery"
+
+
+def test_shared_keyword_belongs_to_the_higher_priority_rule():
+    matcher = IntentMatcher([rule("low", 1, "battery"), rule("high", 9, "battery")])
+    assert matcher.classify("battery")["name"] == "high"
+
+
+def test_no_rules_gives_the_default_response():
+    assert IntentMatcher([]).respond("hello") == DEFAULT_RESPONSE
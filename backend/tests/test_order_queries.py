@@ -0,0 +1,54 @@
+"""Order list endpoints serialize from one orders LEFT JOIN tickets query,
+so the number of statements per request must not grow with the orders."""
+import pytest
+
+from conftest import CUSTOMER_ID, AGENT_ID, auth_headers
+from extensions import db
+from models.component_order import ComponentOrder
+from models.ticket import Ticket
+
+N = 10
+
+
+def add_orders(n):
+    start = ComponentOrder.query.count()
+    for i in range(start, start + n):
+        ticket = Ticket(description=f"ticket {i}", customer_id=CUSTOMER_ID)
+        db.session.add(ticket)
+        db.session.flush()
+        db.session.add(ComponentOrder(order_id=f"T-{i}", customer_id=CUSTOMER_ID, ticket_id=ticket.id,
+                                      device_type="mobile", component_name="Battery"))
+    db.session.commit()
+
+
+def count_queries(client, queries, url, headers, expected_rows):
+    queries.clear()
+    resp = client.get(url, headers=headers)
+    assert resp.status_code == 200
+    assert len(resp.get_json()) == expected_rows
+    return len(queries)
+
+
+@pytest.mark.parametrize("role,user_id", [("admin", AGENT_ID), ("customer", CUSTOMER_ID)])
+def test_get_all_orders_query_count_is_constant(client, queries, role, user_id):
+    url = "/api/orders/get_all_orders?limit=1000"
+    headers = auth_headers(role, user_id)
+    add_orders(N)
+    small = count_queries(client, queries, url, headers, N)
+    add_orders(9 * N)
+    large = count_queries(client, queries, url, headers, 10 * N)
+    assert large == small
+
+
+def test_get_all_orders_items_carry_their_ticket(client):
+    add_orders(3)
+    items = client.get("/api/orders/get_all_orders", headers=auth_headers()).get_json()
+    assert all(o["ticket"]["id"] == o["ticket_id"] for o in items)
+
+
+def test_test_orders_query_count_is_constant(client, queries):
+    add_orders(N)
+    small = count_queries(client, queries, "/api/orders/test_orders", {}, N)
+    add_orders(9 * N)
+    large = count_queries(client, queries, "/api/orders/test_orders", {}, 10 * N)
+    assert large == small
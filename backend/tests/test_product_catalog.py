@@ -0,0 +1,53 @@
+"""ProductCatalog.put/remove update the maps and name index one product at
+a time; after any sequence of writes they must match a full reload."""
+import random
+
+from extensions import db
+from models.product import Product, PRODUCT_ROW
+from utils.product_catalog import ProductCatalog
+
+NAMES = ["Galaxy S24", "galaxy s24", "iPhone 15", "ThinkPad X1", "ThinkPad X1"]
+
+
+def test_incremental_writes_match_full_load(app):
+    rng = random.Random(7)
+    catalog = ProductCatalog()
+    catalog.load()
+    for _ in range(300):
+        product_id = rng.randint(1, 40)
+        row = db.session.get(Product, product_id)
+        if rng.random() < 0.3:
+            if row is not None:
+                db.session.delete(row)
+                db.session.commit()
+            catalog.remove(product_id)
+            continue
+        if row is None:
+            row = Product(id=product_id)
+            db.session.add(row)
+        row.name = rng.choice(NAMES)
+        row.category = rng.choice(["mobile", "laptop"])
+        db.session.commit()
+        catalog.put(PRODUCT_ROW(Product.rows_query().filter(Product.id == product_id).one()))
+
+    fresh = ProductCatalog()
+    fresh.load()
+    by_id, by_key, ids, index = catalog._maps
+    assert (by_id, by_key, ids) == fresh._maps[:3]
+    for name in NAMES + ["galaxy  s24", "Thinkpad X2", "iphone 16"]:
+        for category in ["mobile", "laptop"]:
+            assert index.resolve(name, category) == fresh._maps[3].resolve(name, category)
+
+
+def test_put_does_not_rebuild_the_index(app):
+    catalog = ProductCatalog()
+    catalog.load()
+    index = catalog._maps[3]
+    catalog.put({"id": 5, "name": "Galaxy S24", "category": "mobile"})
+    catalog.put({"id": 3, "name": "Galaxy S24", "category": "mobile"})
+    assert catalog._maps[3] is index
+    assert catalog._maps[2] == [3, 5]
+    assert catalog.find("Galaxy S24", "mobile")["id"] == 3
+    catalog.remove(3)
+    assert catalog._maps[2] == [5]
+    assert catalog._resolve("galaxy s24", "mobile")[0]["id"] == 5
@@ -0,0 +1,77 @@
+"""EXPLAIN QUERY PLAN regression tests for the queries behind hot endpoints.
+
+Each case calls the endpoint and explains every query it actually sent,
+so the plans follow the real query builders. On SQLite a plan line of
+the form "SCAN <table>" (without USING INDEX) is a full table scan and
+fails the test.
+"""
+import re
+
+import pytest
+from sqlalchemy import event
+
+from conftest import CUSTOMER_ID, AGENT_ID, auth_headers
+from extensions import db
+from models.counter import Counter
+
+_FULL_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+# (endpoint, role, user id); filtered variants cover each indexed filter
+HOT_ENDPOINTS = [
+    ("/api/tickets/get_all_ticket", "customer", CUSTOMER_ID),
+    ("/api/tickets/get_all_ticket?customer_id=1", "admin", AGENT_ID),
+    ("/api/tickets/get_all_ticket?status=Open", "admin", AGENT_ID),
+    ("/api/tickets/get_all_ticket?assigned_to=2", "admin", AGENT_ID),
+    ("/api/tickets/get_all_ticket?product_id=1", "admin", AGENT_ID),
+    ("/api/tickets/history/1", "customer", CUSTOMER_ID),
+    ("/api/tickets/search?q=screen+broken", "admin", AGENT_ID),
+    ("/api/orders/get_all_orders", "customer", CUSTOMER_ID),
+    ("/api/orders/get_all_orders?customer_id=1", "admin", AGENT_ID),
+    ("/api/orders/get_all_orders?ticket_id=1", "admin", AGENT_ID),
+    ("/api/orders/get_all_orders?status=Ordered", "admin", AGENT_ID),
+    ("/api/admin/view_customer_feedback?user_id=2", "admin", AGENT_ID),
+    ("/api/admin/stats", "admin", AGENT_ID),
+]
+
+
+_EXPLAINED = ("SELECT", "UPDATE", "DELETE")
+
+
+@pytest.fixture
+def statements(app):
+    """(statement, parameters) of every SELECT, UPDATE and DELETE run while
+    the test runs."""
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(_EXPLAINED):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(db.engine, "before_cursor_execute", record)
+
+
+def full_scans(statement, parameters):
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows if _FULL_SCAN_RE.match(row[-1].strip())]
+
+
+def assert_no_full_scans(captured):
+    assert captured, "no query was captured"
+    for statement, parameters in captured:
+        scans = full_scans(statement, parameters)
+        assert not scans, f"{'; '.join(scans)} in: {statement}"
+
+
+@pytest.mark.parametrize("url,role,user_id", HOT_ENDPOINTS)
+def test_endpoint_queries_use_indexes(client, statements, url, role, user_id):
+    resp = client.get(url, headers=auth_headers(role, user_id))
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    assert_no_full_scans(statements)
+
+
+def test_counter_reconcile_queries_use_indexes(statements):
+    # Backs /api/admin/stats; COUNT(*) over a whole table reads an index
+    Counter.reconcile()
+    assert_no_full_scans(statements)
@@ -0,0 +1,72 @@
+"""Bulk ticket import: per-batch commits, resuming after a failure part way,
+and the Postgres id sequence update for explicit ids."""
+from sqlalchemy.dialects import postgresql
+
+import utils.ticket_import as ticket_import
+from conftest import CUSTOMER_ID, auth_headers
+from extensions import db
+from models.ticket import Ticket
+
+URL = "/api/tickets/import?batch_size=2"
+
+
+def tickets(n, start=0):
+    return [{"description": f"ticket {i}", "customer_id": CUSTOMER_ID} for i in range(start, start + n)]
+
+
+def test_import_commits_every_batch(client):
+    resp = client.post(URL, json=tickets(5) + [{"description": "no customer"}], headers=auth_headers())
+    assert resp.status_code == 200
+    report = resp.get_json()
+    assert (report["inserted"], report["failed"], report["batches"]) == (5, 1, 3)
+    assert report["errors"] == [{"row": 5, "error": "customer_id is required"}]
+    assert "resume_from_row" not in report
+    assert db.session.query(Ticket).count() == 5
+
+
+def test_failure_part_way_reports_where_to_resume(client, monkeypatch):
+    stage = ticket_import._stage_side_effects
+    calls = []
+
+    def fail_third_batch(rows):
+        calls.append(rows)
+        if len(calls) == 3:
+            raise RuntimeError("disk full")
+        stage(rows)
+
+    monkeypatch.setattr(ticket_import, "_stage_side_effects", fail_third_batch)
+    # Row 1 is invalid, so the third batch of valid rows starts at row 5
+    items = tickets(1) + [{"customer_id": CUSTOMER_ID}] + tickets(6, start=2)
+    resp = client.post(URL, json=items, headers=auth_headers())
+
+    assert resp.status_code == 500
+    report = resp.get_json()
+    assert report["error"] == "disk full"
+    assert report["inserted"] == 4
+    assert report["resume_from_row"] == 5
+    assert [e["row"] for e in report["errors"]] == [1]
+    assert db.session.query(Ticket).count() == 4
+
+    monkeypatch.setattr(ticket_import, "_stage_side_effects", stage)
+    resp = client.post(URL, json=items[report["resume_from_row"]:], headers=auth_headers())
+    assert resp.status_code == 200
+    assert resp.get_json()["inserted"] == 3
+    assert sorted(t.description for t in Ticket.query) == [f"ticket {i}" for i in [0, *range(2, 8)]]
+
+
+def test_id_sequence_statement_compiles_for_postgres():
+    sql = ticket_import.id_sequence_statement(42).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    assert " ".join(str(sql).split()) == (
+        "SELECT setval(CAST(pg_get_serial_sequence('tickets', 'id') AS REGCLASS), "
+        "greatest(nextval(CAST(pg_get_serial_sequence('tickets', 'id') AS REGCLASS)), 42)) AS setval_1"
+    )
+
+
+def test_explicit_ids_on_sqlite(client, queries):
+    items = [{"id": 100, "description": "imported", "customer_id": CUSTOMER_ID}] + tickets(1)
+    queries.clear()
+    resp = client.post(URL, json=items, headers=auth_headers())
+    assert resp.get_json()["inserted"] == 2
+    assert not any("setval" in q for q in queries)
+    assert sorted(t.id for t in Ticket.query) == [100, 101]
@@ -0,0 +1,65 @@
+"""Ticket list endpoints serialize from one joined query, so the number of
+statements per request must not grow with the number of tickets."""
+import pytest
+
+from conftest import CUSTOMER_ID, AGENT_ID, auth_headers
+from extensions import db
+from models.product import Product
+from models.ticket import Ticket
+
+N = 10
+
+
+def add_tickets(n, product_id=None):
+    for i in range(n):
+        product = Product(name=f"Model {i}", category="laptop")
+        db.session.add(product)
+        db.session.flush()
+        db.session.add(Ticket(description=f"ticket {i}", customer_id=CUSTOMER_ID,
+                              assigned_to=AGENT_ID, product_id=product_id or product.id))
+    db.session.commit()
+
+
+def count_queries(client, queries, url, headers, expected_rows):
+    queries.clear()
+    resp = client.get(url, headers=headers)
+    assert resp.status_code == 200
+    assert len(resp.get_json()) == expected_rows
+    return len(queries)
+
+
+@pytest.mark.parametrize("role,user_id", [("admin", AGENT_ID), ("customer", CUSTOMER_ID)])
+def test_get_all_ticket_query_count_is_constant(client, queries, role, user_id):
+    url = "/api/tickets/get_all_ticket?limit=1000"
+    headers = auth_headers(role, user_id)
+    add_tickets(N)
+    small = count_queries(client, queries, url, headers, N)
+    add_tickets(9 * N)
+    large = count_queries(client, queries, url, headers, 10 * N)
+    assert large == small
+
+
+def test_get_all_ticket_items_carry_their_product(client):
+    add_tickets(3)
+    items = client.get("/api/tickets/get_all_ticket", headers=auth_headers()).get_json()
+    assert all(t["product"]["id"] == t["product_id"] for t in items)
+
+
+def test_test_tickets_query_count_is_constant(client, queries):
+    add_tickets(N)
+    small = count_queries(client, queries, "/api/tickets/test_tickets", {}, N)
+    add_tickets(9 * N)
+    large = count_queries(client, queries, "/api/tickets/test_tickets", {}, 10 * N)
+    assert large == small
+
+
+def test_history_query_count_is_constant(client, queries):
+    product = Product(name="Shared", category="mobile")
+    db.session.add(product)
+    db.session.commit()
+    url = f"/api/tickets/history/{product.id}"
+    add_tickets(N, product_id=product.id)
+    small = count_queries(client, queries, url, auth_headers(), N)
+    add_tickets(9 * N, product_id=product.id)
+    large = count_queries(client, queries, url, auth_headers(), 10 * N)
+    assert large == small
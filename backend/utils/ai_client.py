@@ -1,61 +1,142 @@
 import os
-from openai import OpenAI
+import random
+import time
 from dotenv import load_dotenv
-from .faq_memory import FAQ_MEMORY
+from .faq_memory import FAQ_INDEX, faq_version
+from .prompt_builder import PromptBuilder
+from .circuit_breaker import CircuitBreaker
+from .ai_providers import make_provider
 
 load_dotenv()  # load .env variables
 
 # Load your OpenRouter API key from .env
 OPENROUTER_KEY = os.getenv("OPENROUTER_API_KEY")
 
-# Configure OpenRouter client
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_KEY
+# Per-attempt timeout, overall deadline per chat request, and retry budget
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", "10"))
+AI_DEADLINE = float(os.getenv("AI_DEADLINE", "20"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))
+AI_RETRY_BACKOFF = float(os.getenv("AI_RETRY_BACKOFF", "0.5"))
+
+# Active provider, chosen by AI_PROVIDER (see configure_provider)
+provider = None
+
+breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("AI_BREAKER_FAILURES", "5")),
+    slow_call_seconds=float(os.getenv("AI_BREAKER_SLOW_CALL", "8")),
+    reset_timeout=float(os.getenv("AI_BREAKER_RESET", "30")),
 )
 
 
+class AIUnavailableError(Exception):
+    """The provider failed, timed out, or the circuit breaker is open."""
 
 
-def ask_ai_faq(query):
-    faq_context = "\n\n".join(
-            [f"Q: {f['question']}\nA: {f['answer']}" for f in FAQ_MEMORY]
-        )
-    print(faq_context)
-    SYSTEM_PROMPT = f"""
-You are a strict customer support chatbot.
-
-You must ONLY handle:
-- product issues
-- billing issues
-- account support
-- troubleshooting
-- refunds, returns, and order-related questions
-
-Below is the FAQ knowledge base:
-{faq_context}
-
-User asked: "{query}"
-
-Your rules:
-1. First check if the user's question MATCHES or is SIMILAR to any FAQ.
-2. If it matches, reply ONLY with the FAQ answer.
-3. If not in the FAQ, generate your own correct customer-support answer.
-4. If the query is NOT related to customer support, reply exactly:
-   "I can assist only with customer support–related queries."
-"""
+# A local FAQ match at or above this confidence is answered without the LLM
+FAQ_DIRECT_THRESHOLD = float(os.getenv("FAQ_DIRECT_THRESHOLD", "0.85"))
+# Number of relevant FAQs pasted into the prompt otherwise
+FAQ_PROMPT_TOP_K = int(os.getenv("FAQ_PROMPT_TOP_K", "5"))
+
+# Token budget for the whole system prompt (template + FAQs + query)
+prompt_builder = PromptBuilder(
+    token_budget=int(os.getenv("AI_PROMPT_TOKEN_BUDGET", "2000")),
+    max_query_tokens=int(os.getenv("AI_MAX_QUERY_TOKENS", "300")),
+)
+
+
+def configure_provider(name=None, api_key=None):
+    """Select the completion provider: "openrouter" (default) or "fake"."""
+    global provider
+    provider = make_provider(
+        name or os.getenv("AI_PROVIDER", "openrouter"),
+        # OPENROUTER_API_KEY keeps precedence over the generic AI_API_KEY
+        api_key=OPENROUTER_KEY or api_key,
+        timeout=AI_TIMEOUT,
+    )
+    return provider
+
+
+def build_prompt(query):
+    """Return (direct_answer, system_prompt); exactly one of them is set."""
+    matches = FAQ_INDEX.search(query, k=FAQ_PROMPT_TOP_K)
+    if matches and matches[0][0] >= FAQ_DIRECT_THRESHOLD:
+        return matches[0][1]["answer"], None
+
+    return None, prompt_builder.build(query, [f for _, f in matches], faq_version())
+
+
+def _recorded(chunks, started):
+    """Pass a provider stream through and report the call to the breaker
+    once it ends: with the full latency, as a failure if reading it raised."""
+    ok = False
     try:
+        yield from chunks
+        ok = True
+    except GeneratorExit:
+        ok = True  # the client went away, not the provider
+        raise
+    finally:
+        breaker.record(time.monotonic() - started, ok=ok)
+
+
+def _completion(system_prompt, stream=False):
+    """Call the provider within AI_DEADLINE, retrying with jittered backoff.
+
+    Raises AIUnavailableError without touching the network while the
+    circuit breaker is open.
+    """
+    deadline = time.monotonic() + AI_DEADLINE
+    last_err = None
+
+    for attempt in range(AI_MAX_RETRIES + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if not breaker.allow():
+            raise AIUnavailableError("AI provider unavailable (circuit open)")
+
+        started = time.monotonic()
+        try:
+            response = (provider or configure_provider()).complete(
+                system_prompt, stream=stream, timeout=min(AI_TIMEOUT, remaining)
+            )
+        except Exception as e:
+            breaker.record(time.monotonic() - started, ok=False)
+            last_err = e
+        else:
+            if stream:
+                return _recorded(response, started)
+            breaker.record(time.monotonic() - started)
+            return response
+
+        if attempt == AI_MAX_RETRIES:
+            break  # no retry left to wait for
+        # Full jitter, never sleeping past the deadline
+        backoff = random.uniform(0, AI_RETRY_BACKOFF * (2 ** attempt))
+        time.sleep(max(0.0, min(backoff, deadline - time.monotonic())))
+
+    raise AIUnavailableError(f"AI request failed: {last_err or 'deadline exceeded'}")
+
+
+def ask_ai_faq(query):
+    """Answer a query, raising AIUnavailableError if the provider fails."""
+    answer, system_prompt = build_prompt(query)
+    if answer is not None:
+        return answer
+
+    return _completion(system_prompt)
+
 
-        response = client.chat.completions.create(
-            model="deepseek/deepseek-chat",   # FREE MODEL
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                
+def ask_ai_faq_stream(query):
+    """Yield the answer as text chunks as the provider produces them.
 
-            ]
-        )
-        return response.choices[0].message.content
+    Errors are raised to the caller, which owns the response stream.
+    AIUnavailableError is raised before the first chunk if the provider
+    cannot be reached.
+    """
+    answer, system_prompt = build_prompt(query)
+    if answer is not None:
+        yield answer
+        return
 
-    except Exception as e:
-        # Prevent Flask from crashing
-        return {"error": f"AI request failed: {str(e)}"}
+    yield from _completion(system_prompt, stream=True)
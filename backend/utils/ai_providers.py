@@ -0,0 +1,131 @@
+import math
+import os
+import random
+import threading
+import time
+from openai import OpenAI
+
+
+class ProviderError(Exception):
+    """Raised by a provider when a completion fails."""
+
+
+class OpenRouterProvider:
+    """Chat completions through OpenRouter's OpenAI-compatible API."""
+
+    def __init__(self, api_key=None, model="deepseek/deepseek-chat", timeout=10.0):
+        self.model = model
+        # Retries are handled by ai_client, not by the SDK
+        self.client = OpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=api_key,
+            timeout=timeout,
+            max_retries=0,
+        )
+
+    def complete(self, system_prompt, stream=False, timeout=None):
+        """Return the answer text, or an iterator of text chunks if stream."""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+            ],
+            stream=stream,
+            timeout=timeout,
+        )
+        if not stream:
+            return response.choices[0].message.content
+        return self._chunks(response)
+
+    @staticmethod
+    def _chunks(response):
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+def parse_latency(spec):
+    """Build a latency sampler (seconds) from a spec string.
+
+    fixed:0.2 | uniform:0.1:0.5 | normal:0.3:0.05 | lognormal:0.3:0.5
+    (lognormal takes the median and sigma).
+    """
+    kind, *args = spec.split(":")
+    args = [float(a) for a in args]
+    if kind == "fixed":
+        return lambda rng: args[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal":
+        mu = math.log(args[0])
+        return lambda rng: rng.lognormvariate(mu, args[1])
+    raise ValueError(f"unknown latency distribution: {spec}")
+
+
+class FakeProvider:
+    """Local provider for benchmarks and tests; never touches the network.
+
+    Total latency is drawn from `latency`; when streaming it is spread
+    evenly across chunks of `chunk_words` words. A fraction `error_rate` of
+    calls fail with ProviderError, and calls longer than the timeout fail
+    the way a real client timeout would.
+    """
+
+    def __init__(self, latency="fixed:0.05", error_rate=0.0, chunk_words=3,
+                 answer="Please restart your device and contact support if the issue persists.",
+                 seed=None):
+        self._sample = parse_latency(latency)
+        self.error_rate = error_rate
+        self.chunk_words = max(1, chunk_words)
+        self.answer = answer
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            return self._sample(self._rng), self._rng.random() < self.error_rate
+
+    def complete(self, system_prompt, stream=False, timeout=None):
+        latency, fail = self._draw()
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise ProviderError("fake provider timed out")
+        if fail:
+            time.sleep(latency)
+            raise ProviderError("fake provider error")
+        if not stream:
+            time.sleep(latency)
+            return self.answer
+        return self._chunks(latency)
+
+    def _chunks(self, latency):
+        words = self.answer.split(" ")
+        chunks = [" ".join(words[i:i + self.chunk_words]) + " "
+                  for i in range(0, len(words), self.chunk_words)]
+        chunks[-1] = chunks[-1].rstrip()
+        delay = latency / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            yield chunk
+
+
+def make_provider(name, api_key=None, timeout=10.0):
+    """Provider for an AI_PROVIDER value."""
+    if name == "openrouter":
+        return OpenRouterProvider(api_key=api_key, timeout=timeout)
+    if name == "fake":
+        seed = os.getenv("AI_FAKE_SEED")
+        return FakeProvider(
+            latency=os.getenv("AI_FAKE_LATENCY", "fixed:0.05"),
+            error_rate=float(os.getenv("AI_FAKE_ERROR_RATE", "0")),
+            chunk_words=int(os.getenv("AI_FAKE_CHUNK_WORDS", "3")),
+            seed=int(seed) if seed else None,
+        )
+    raise ValueError(f"unknown AI_PROVIDER: {name}")
@@ -0,0 +1,52 @@
+from flask import current_app
+from sqlalchemy import select
+from extensions import db
+from utils.pagination import filter_conditions
+
+
+class BulkUpdateError(ValueError):
+    """Bad bulk selection; reported to the client as a 400."""
+
+
+def bulk_selection(model, filters, data):
+    """WHERE conditions for a bulk request body.
+
+    The body names rows by {"ids": [...]}, by {"filter": {name: value}}
+    over the `filters` columns, or both (rows must match both). One of them
+    is required so a typo can never select the whole table.
+    """
+    ids = data.get("ids")
+    where = data.get("filter") or {}
+    if not ids and not where:
+        raise BulkUpdateError("ids or filter is required")
+
+    conditions = []
+    if ids:
+        max_ids = current_app.config.get("BULK_UPDATE_MAX_IDS", 10000)
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise BulkUpdateError("ids must be a list of integers")
+        if len(ids) > max_ids:
+            raise BulkUpdateError(f"too many ids: {len(ids)} > {max_ids}")
+        conditions.append(model.id.in_(ids))
+    if where:
+        if not isinstance(where, dict):
+            raise BulkUpdateError("filter must be an object")
+        unknown = set(where) - set(filters)
+        if unknown:
+            raise BulkUpdateError(f"unknown filter: {', '.join(sorted(unknown))}")
+        conditions += filter_conditions(filters, {k: v if v is None else str(v) for k, v in where.items()})
+    return conditions
+
+
+def update_returning_ids(model, conditions, values):
+    """UPDATE model SET values WHERE conditions as one statement; returns
+    the ids of the rows it changed (via RETURNING where supported)."""
+    table = model.__table__
+    stmt = table.update().where(*conditions).values(values)
+    if db.session.get_bind().dialect.update_returning:
+        return [row[0] for row in db.session.execute(stmt.returning(table.c.id))]
+
+    ids = [row[0] for row in db.session.execute(select(table.c.id).where(*conditions))]
+    if ids:
+        db.session.execute(table.update().where(table.c.id.in_(ids)).values(values))
+    return ids
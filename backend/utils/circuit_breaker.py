@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with latency tracking.
+
+    Calls slower than `slow_call_seconds` count as failures even when they
+    succeed. After `failure_threshold` failures in a row the breaker opens
+    and rejects calls for `reset_timeout` seconds, then lets a single probe
+    through (half-open) to decide whether to close again.
+    """
+
+    def __init__(self, failure_threshold=5, slow_call_seconds=10.0, reset_timeout=30.0, window=200):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies = deque(maxlen=window)
+        self.total_calls = 0
+        self.total_failures = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self):
+        """Return True if a call may go to the upstream right now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, latency, ok=True):
+        with self._lock:
+            self.total_calls += 1
+            self._latencies.append(latency)
+            if ok and latency < self.slow_call_seconds:
+                self._state = CLOSED
+                self._failures = 0
+                self._probe_in_flight = False
+                return
+
+            self.total_failures += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "total_calls": self.total_calls,
+                "total_failures": self.total_failures,
+                "rejected": self.rejected,
+                "latency_avg": (sum(latencies) / len(latencies)) if latencies else None,
+                "latency_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+                "latency_max": latencies[-1] if latencies else None,
+            }
@@ -0,0 +1,66 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request, make_response, current_app, g
+from models.table_version import TableVersion
+
+
+def _etag(table, version, modified):
+    args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    raw = f"{table}:{version}:{modified.isoformat() if modified else ''}:{args}"
+    return f"{table}-{hashlib.sha1(raw.encode()).hexdigest()[:20]}"
+
+
+def _not_modified(etag, modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    if since and modified:
+        return modified.replace(microsecond=0, tzinfo=timezone.utc) <= since
+    return False
+
+
+def _set_validators(resp, etag, modified, private):
+    resp.set_etag(etag)
+    if modified:
+        resp.last_modified = modified.replace(tzinfo=timezone.utc)
+    max_age = current_app.config.get("CONDITIONAL_GET_MAX_AGE", 0)
+    scope = "private" if private else "public"
+    resp.headers["Cache-Control"] = f"{scope}, max-age={max_age}, must-revalidate"
+    return resp
+
+
+def conditional_get(table, private=False):
+    """Serve a read endpoint with ETag / Last-Modified validators.
+
+    Both are derived from the TableVersion stamp of `table` and the query
+    string. The stamp is read before the view runs, so a matching
+    If-None-Match (or If-Modified-Since) gets a 304 without the view ever
+    querying or serializing the table. `private` marks responses that need
+    authentication and so must not be stored by shared caches.
+
+    A view that serves from a cache must serve data at least as new as the
+    validators; validated_version() gives it the stamp they were built from.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, modified = TableVersion.stamp(table)
+            etag = _etag(table, version, modified)
+            g.validated_version = version
+            if _not_modified(etag, modified):
+                resp = current_app.response_class(status=304)
+                return _set_validators(resp, etag, modified, private)
+
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code == 200:
+                _set_validators(resp, etag, modified, private)
+            return resp
+        return wrapper
+    return decorator
+
+
+def validated_version():
+    """Stamp version behind the current response's validators, or None
+    outside a conditional_get view."""
+    return g.get("validated_version")
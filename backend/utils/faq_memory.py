@@ -1,13 +1,175 @@
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
 from models.faq import Faq
+from models.faq_change import FaqChange
+
+FAQ_MEMORY = []
+
+# How often (seconds) a worker checks the DB version stamp for FAQ changes
+FAQ_SYNC_INTERVAL = float(os.getenv("FAQ_SYNC_INTERVAL", "5"))
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "can", "do", "does", "for", "how", "i", "in",
+    "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when",
+    "where", "why", "with", "you", "your",
+}
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class FaqIndex:
+    """BM25 index over the FAQ questions (answers are weighted lower).
+
+    Term frequencies are stored as a sparse term -> postings matrix, so a
+    query only touches the columns of the terms it contains. build() works
+    on locals and swaps the finished index in with one assignment, so a
+    search running during a rebuild sees either the old or the new index.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, answer_weight=0.5):
+        self.k1 = k1
+        self.b = b
+        self.answer_weight = answer_weight
+        self.build([])
+
+    @property
+    def faqs(self):
+        return self._data[0]
+
+    def build(self, faqs):
+        faqs = list(faqs)
+        postings = defaultdict(list)  # term -> [(doc_idx, tf)]
+        doc_len = []
+        question_terms = []
+        for i, f in enumerate(faqs):
+            tf = Counter(tokenize(f["question"]))
+            question_terms.append(set(tf))
+            for term, n in Counter(tokenize(f["answer"])).items():
+                tf[term] += n * self.answer_weight
+            for term, n in tf.items():
+                postings[term].append((i, n))
+            doc_len.append(sum(tf.values()))
+
+        n_docs = len(faqs)
+        avg_len = (sum(doc_len) / n_docs) if n_docs else 0.0
+        idf = {
+            term: math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in postings.items()
+        }
+        scoring = (dict(postings), doc_len, avg_len, idf)
+        # Score each FAQ against its own question: a query identical to the
+        # question scores 1.0 confidence, which makes a fixed threshold usable.
+        self_scores = [
+            self._scores(scoring, tokenize(f["question"])).get(i, 0.0)
+            for i, f in enumerate(faqs)
+        ]
+        self._data = (faqs, question_terms, self_scores, scoring)
+
+    def _scores(self, scoring, terms):
+        postings, doc_len, avg_len, idf = scoring
+        scores = defaultdict(float)
+        for term in set(terms):
+            weight = idf.get(term)
+            if weight is None:
+                continue
+            for i, tf in postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * doc_len[i] / avg_len)
+                scores[i] += weight * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query, k=5):
+        """Return up to k (confidence, faq) pairs, best match first.
+
+        Confidence is the BM25 score relative to the FAQ's own question,
+        scaled by how much of the query the question covers.
+        """
+        faqs, question_terms, self_scores, scoring = self._data  # one snapshot
+        terms = set(tokenize(query))
+        scores = self._scores(scoring, terms)
+        results = []
+        for i, score in scores.items():
+            best = self_scores[i]
+            coverage = len(terms & question_terms[i]) / len(terms)
+            confidence = min(score / best, 1.0) * coverage if best else 0.0
+            results.append((confidence, score, i))
+        results.sort(key=lambda r: (r[0], r[1]), reverse=True)
+        return [(conf, faqs[i]) for conf, _, i in results[:k]]
+
+
+FAQ_INDEX = FaqIndex()
+
+_faqs_by_id = {}
+_state = {"version": 0, "checked_at": 0.0}
+_sync_lock = threading.Lock()
+
+
+def faq_version():
+    """Version of the FAQ snapshot currently held by this worker."""
+    return _state["version"]
+
+
+def _faq_entry(f):
+    return {
+        "id": f.id,
+        "question": f.question,
+        "answer": f.answer
+    }
+
+
+def _publish():
+    FAQ_MEMORY[:] = [_faqs_by_id[i] for i in sorted(_faqs_by_id)]
+    FAQ_INDEX.build(FAQ_MEMORY)
 
-FAQ_MEMORY = [] 
 
 def load_faq_into_memory():
-    faqs = Faq.query.all()
-    FAQ_MEMORY.clear()
-
-    for f in faqs:
-        FAQ_MEMORY.append({
-            "question": f.question,
-            "answer": f.answer
-        })
\ No newline at end of file
+    """Full load; used once at startup."""
+    with _sync_lock:
+        version = FaqChange.current_version()
+        _faqs_by_id.clear()
+        for f in Faq.query.all():
+            _faqs_by_id[f.id] = _faq_entry(f)
+        _publish()
+        _state["version"] = version
+        _state["checked_at"] = time.monotonic()
+
+
+def sync_faq_memory(force=False):
+    """Apply FAQ changes made since our version, by any worker.
+
+    Costs one max() lookup when nothing changed; otherwise only the changed
+    rows are read. Returns True if the in-memory FAQs changed.
+    """
+    now = time.monotonic()
+    if not force and now - _state["checked_at"] < FAQ_SYNC_INTERVAL:
+        return False
+
+    with _sync_lock:
+        _state["checked_at"] = now
+        if FaqChange.current_version() <= _state["version"]:
+            return False
+
+        changes = (
+            FaqChange.query
+            .filter(FaqChange.version > _state["version"])
+            .order_by(FaqChange.version)
+            .all()
+        )
+        changed_ids = {c.faq_id for c in changes}
+        rows = {f.id: f for f in Faq.query.filter(Faq.id.in_(changed_ids)).all()}
+        for faq_id in changed_ids:
+            if faq_id in rows:
+                _faqs_by_id[faq_id] = _faq_entry(rows[faq_id])
+            else:
+                _faqs_by_id.pop(faq_id, None)
+
+        _publish()
+        _state["version"] = changes[-1].version
+        return True
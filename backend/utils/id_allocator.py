@@ -0,0 +1,60 @@
+import os
+import threading
+from extensions import db
+from models.id_block import IdBlock
+from utils.upsert import upsert_increment
+
+ORDER_ID_START = int(os.getenv("ORDER_ID_START", "10000"))
+ORDER_ID_BLOCK_SIZE = int(os.getenv("ORDER_ID_BLOCK_SIZE", "100"))
+
+
+class IdAllocator:
+    """Unique, human-readable ids (prefix + integer) from reserved blocks.
+
+    Each process reserves `block_size` numbers at a time by atomically
+    bumping its row in id_blocks on a separate connection and commit, then
+    hands them out from memory. Ids are unique across processes and hosts
+    sharing the database, need no retry on insert, and cost one round trip
+    per block. Numbers left in a block when a process exits are skipped.
+    `start` must never decrease once ids have been issued.
+    """
+
+    def __init__(self, name, prefix="", start=1, block_size=100):
+        self.name = name
+        self.prefix = prefix
+        self.start = start
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0  # exclusive end of the current block
+        self.blocks = 0
+
+    def _reserve(self):
+        # Own transaction: the block must stay reserved even if the request
+        # that triggered it rolls back.
+        table = IdBlock.__table__
+        with db.engine.begin() as conn:
+            upsert_increment(IdBlock, {'name': self.name}, {'allocated': self.block_size}, connection=conn)
+            allocated = conn.execute(
+                db.select(table.c.allocated).where(table.c.name == self.name)
+            ).scalar_one()
+        self._end = self.start + allocated
+        self._next = self._end - self.block_size
+        self.blocks += 1
+
+    def next_number(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve()
+            n = self._next
+            self._next += 1
+            return n
+
+    def next_id(self):
+        return f"{self.prefix}{self.next_number()}"
+
+
+# Legacy order ids were random P-1000..P-9999; starting at 10000 keeps the
+# new ones clear of them.
+order_ids = IdAllocator('component_orders.order_id', prefix="P-",
+                        start=ORDER_ID_START, block_size=ORDER_ID_BLOCK_SIZE)
@@ -0,0 +1,137 @@
+import json
+import os
+import re
+
+# Keyword fallback rules, highest priority first. Override with a JSON file
+# of the same shape via AI_INTENTS_FILE.
+DEFAULT_INTENTS = [
+    {
+        "name": "greeting",
+        "priority": 60,
+        "keywords": ["hello", "hi", "hey"],
+        "response": "Hello! I'm here to help with your technical support questions. How can I assist you today?",
+    },
+    {
+        "name": "battery",
+        "priority": 50,
+        "keywords": ["battery", "batteries", "charging", "charger", "charge", "charged", "charges",
+                     "recharge", "recharging"],
+        "response": "For battery and charging issues, please check if the charging cable is properly connected. Try using a different charger if available. If the issue persists, you can create a support ticket for further assistance.",
+    },
+    {
+        "name": "display",
+        "priority": 40,
+        "keywords": ["screen", "screens", "touchscreen", "display", "displays", "displayed", "displaying"],
+        "response": "For screen or display issues, try restarting your device first. Check if the issue occurs in different apps or only specific ones. If the problem continues, please create a support ticket with details about when the issue started.",
+    },
+    {
+        "name": "performance",
+        "priority": 30,
+        "keywords": ["slow", "slowly", "slower", "slowing", "slowdown", "lag", "laggy", "lagging",
+                     "performance"],
+        "response": "For performance issues, try closing unused apps and restarting your device. Check available storage space. If your device continues to be slow, consider creating a support ticket for hardware diagnosis.",
+    },
+    {
+        "name": "ticket",
+        "priority": 20,
+        "keywords": ["ticket", "tickets", "support", "supported", "help", "helps", "helped", "helping",
+                     "helpful"],
+        "response": "You can create a support ticket by clicking 'Create New Ticket' on the dashboard. This will help us track and resolve your issue efficiently. Our support team typically responds within 24 hours.",
+    },
+    {
+        "name": "warranty",
+        "priority": 10,
+        "keywords": ["warranty", "warranties", "repair", "repairs", "repaired", "repairing"],
+        "response": "For warranty and repair information, please check your device's warranty status in your account. Most repairs are covered under standard warranty for the first year. You can schedule a pickup for diagnosis through our support system.",
+    },
+]
+
+DEFAULT_RESPONSE = "I understand you need help with your device. For the best assistance, I recommend creating a support ticket with specific details about your issue. Our technical team can provide personalized solutions for your problem."
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class IntentMatcher:
+    """Classify a message by keyword rules in one regex pass.
+
+    Every keyword of every rule is compiled into a single regex, factored
+    as one character trie, so the work per word does not depend on the
+    number of rules. The end of each keyword carries an empty capturing
+    group, and the number of the group that matched maps back to its rule.
+    Matching is on whole words; the words of a phrase may be separated by
+    any non-word characters. Matches are zero-width, so every word start
+    is tried even inside a longer phrase. Where a keyword and a longer one
+    share a prefix, the branch leading to the higher-priority rule is
+    tried first. The highest-priority rule among the hits wins, and a hit
+    on the top rule ends the scan.
+    """
+
+    def __init__(self, intents, default_response=DEFAULT_RESPONSE):
+        self.default_response = default_response
+        self._intents = sorted(intents, key=lambda r: r["priority"], reverse=True)
+        ranks = {}  # keyword words -> rank of its highest-priority rule
+        for rank, intent in enumerate(self._intents):
+            for kw in intent["keywords"]:
+                words = tuple(_WORD_RE.findall(kw.lower()))
+                if words:
+                    ranks.setdefault(words, rank)
+        self._group_ranks = [None]  # group number -> rank
+        if ranks:
+            pattern = self._trie_regex(ranks)
+            letters = "".join(sorted({re.escape(words[0][0]) for words in ranks}))
+            self._finditer = re.compile(rf"(?=[{letters}])\b(?={pattern}\b)").finditer
+        else:
+            self._finditer = lambda message: ()
+
+    def _trie_regex(self, ranks):
+        root = {}
+        for words, rank in ranks.items():
+            node = root
+            for i, word in enumerate(words):
+                if i:
+                    node = node.setdefault(r"\W+", {})
+                for ch in word:
+                    node = node.setdefault(re.escape(ch), {})
+            node[""] = rank  # a keyword ends here
+
+        def best_rank(node):
+            return min(v if k == "" else best_rank(v) for k, v in node.items())
+
+        def emit(node):
+            branches = []
+            for key, child in sorted(node.items(), key=lambda kv: kv[1] if kv[0] == "" else best_rank(kv[1])):
+                if key == "":
+                    self._group_ranks.append(child)
+                    branches.append("()")
+                else:
+                    branches.append(key + emit(child))
+            return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+        return emit(root)
+
+    def classify(self, message):
+        """Return the best matching intent dict, or None."""
+        best = None
+        for match in self._finditer((message or "").lower()):
+            rank = self._group_ranks[match.lastindex]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return None if best is None else self._intents[best]
+
+    def respond(self, message):
+        intent = self.classify(message)
+        return intent["response"] if intent else self.default_response
+
+
+def load_intents(path=None):
+    path = path or os.getenv("AI_INTENTS_FILE")
+    if not path:
+        return DEFAULT_INTENTS
+    with open(path) as fh:
+        return json.load(fh)
+
+
+fallback_matcher = IntentMatcher(load_intents())
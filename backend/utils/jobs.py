@@ -0,0 +1,27 @@
+import threading
+
+
+def start_periodic(app, interval, fn, name):
+    """Run fn() inside an app context every `interval` seconds on a daemon
+    thread. Errors are logged and the job keeps running; interval <= 0
+    disables it. Safe to run in every worker as long as fn is idempotent.
+    """
+    if interval <= 0:
+        return None
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    fn()
+                except Exception:
+                    app.logger.exception("periodic job %s failed", name)
+                finally:
+                    from extensions import db
+                    db.session.remove()
+
+    thread = threading.Thread(target=loop, name=name, daemon=True)
+    thread.stop = stop
+    thread.start()
+    return thread
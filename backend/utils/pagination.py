@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import request, jsonify, current_app
+
+
+class PaginationError(ValueError):
+    """Bad cursor, limit or filter value; reported to the client as a 400."""
+
+
+def encode_cursor(last_id, **extra):
+    raw = json.dumps({"id": last_id, **extra}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    return decode_cursor_fields(token)[0]
+
+
+def decode_cursor_fields(token, *names):
+    """(id, *float values of `names`) from a cursor made by encode_cursor."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        return (int(data["id"]),) + tuple(float(data[n]) for n in names)
+    except Exception:
+        raise PaginationError("invalid cursor")
+
+
+def _parse(column, value):
+    if column.type.python_type is datetime:
+        return parse_datetime(value)
+    try:
+        return column.type.python_type(value)
+    except (TypeError, ValueError):
+        raise PaginationError(f"invalid value for {column.key}: {value}")
+
+
+def parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise PaginationError(f"invalid date: {value}, must be ISO format")
+
+
+def page_limit():
+    default = current_app.config.get("PAGE_SIZE_DEFAULT", 100)
+    maximum = current_app.config.get("PAGE_SIZE_MAX", 500)
+    try:
+        limit = int(request.args.get("limit", default))
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, maximum)
+
+
+def filter_conditions(filters, values):
+    """Equality conditions for each name in `filters` (name -> column) that
+    has a non-empty value in the mapping `values`."""
+    return [
+        column == _parse(column, values[name])
+        for name, column in filters.items()
+        if values.get(name) not in (None, "")
+    ]
+
+
+def apply_filters(query, filters=None, date_column=None):
+    """Apply the request's equality filters and created_from/created_to range."""
+    conditions = filter_conditions(filters or {}, request.args)
+    if conditions:
+        query = query.filter(*conditions)
+
+    if date_column is not None:
+        if request.args.get("created_from"):
+            query = query.filter(date_column >= parse_datetime(request.args["created_from"]))
+        if request.args.get("created_to"):
+            query = query.filter(date_column <= parse_datetime(request.args["created_to"]))
+    return query
+
+
+def paginate(query, key_column, descending=True, filters=None, date_column=None):
+    """Apply request filters and a keyset page to `query`.
+
+    Rows are ordered by `key_column` (a unique, indexed column, normally the
+    primary key) and the cursor carries the last key seen, so every page is
+    an index range scan no matter how deep the client pages.
+
+    `filters` maps query-string names to columns compared by equality;
+    `date_column` enables `created_from` / `created_to` (ISO datetimes).
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    query = apply_filters(query, filters, date_column)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        last = decode_cursor(cursor)
+        query = query.filter(key_column < last if descending else key_column > last)
+
+    limit = page_limit()
+    order = key_column.desc() if descending else key_column.asc()
+    rows = query.order_by(order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key_column.key))
+    return rows, next_cursor
+
+
+def page_response(items, next_cursor):
+    """JSON array of `items`; the next page's cursor goes in X-Next-Cursor."""
+    resp = jsonify(items)
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+        resp.headers["Link"] = f'<{_next_url(next_cursor)}>; rel="next"'
+    return resp
+
+
+def _next_url(next_cursor):
+    args = request.args.to_dict()
+    args["cursor"] = next_cursor
+    return f"{request.base_url}?{urlencode(args)}"
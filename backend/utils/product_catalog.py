@@ -0,0 +1,234 @@
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from models.product import Product, PRODUCT_ROW
+from models.table_version import TableVersion, PRODUCTS
+from utils.product_resolver import ProductIndex
+
+PRODUCT_SYNC_INTERVAL = float(os.getenv("PRODUCT_SYNC_INTERVAL", "5"))
+
+
+def _deep_size(obj, seen=None):
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    return size
+
+
+def _key(product):
+    return product["name"], product["category"]
+
+
+class ProductCatalog:
+    """In-process copy of the products table.
+
+    Holds id -> product and (name, category) -> product maps of to_dict()
+    shaped dicts (treat them as read-only), plus a ProductIndex for
+    case-insensitive and fuzzy name resolution. The product write paths
+    update it directly, one product at a time; writes by other workers are
+    noticed by comparing the products TableVersion stamp at most every
+    `sync_interval` seconds, so steady-state lookups never touch the
+    database. A miss costs one query (a primary-key read, or a stamp check
+    for name lookups), so a product created elsewhere a moment ago is still
+    found.
+
+    Readers never lock. A full load swaps in new maps at once; single
+    product updates change the maps in place under the lock, in an order
+    that never shows a reader an id it cannot resolve, and replace the
+    sorted id list only when an id is added or removed.
+    """
+
+    def __init__(self, sync_interval=PRODUCT_SYNC_INTERVAL):
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._maps = ({}, {}, [], ProductIndex([]))  # by_id, by_key, sorted ids, name index
+        self._key_ids = {}  # (name, category) -> ids; writers only
+        self._version = None
+        self._checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.resolved = Counter()
+
+    def _load(self):
+        # Caller holds the lock. Stamp first: a write racing the load
+        # leaves us on the old version, so the next sync reloads again
+        version, _ = TableVersion.stamp(PRODUCTS)
+        by_id = {r.id: PRODUCT_ROW(r) for r in Product.rows_query().all()}
+        ids = sorted(by_id)
+        key_ids = {}
+        for i in ids:
+            key_ids.setdefault(_key(by_id[i]), set()).add(i)
+        by_key = {key: by_id[min(kids)] for key, kids in key_ids.items()}  # lowest id wins
+        self._key_ids = key_ids
+        self._maps = (by_id, by_key, ids, ProductIndex(by_id.values()))
+        self._version = version
+        self._checked_at = time.monotonic()
+        self.reloads += 1
+
+    def load(self):
+        """Full reload from the database."""
+        with self._lock:
+            self._load()
+
+    def sync(self, force=False):
+        """Reload if another writer bumped the products stamp; returns True
+        if it did. Costs one primary-key lookup, at most every interval."""
+        if not force and self._version is not None and time.monotonic() - self._checked_at < self.sync_interval:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._version is not None and now - self._checked_at < self.sync_interval:
+                return False  # another thread checked while we waited
+            self._checked_at = now
+            version, _ = TableVersion.stamp(PRODUCTS)
+            if version == self._version:
+                return False
+            self._load()
+            return True
+
+    def _rekey(self, key):
+        by_id, by_key, _, _ = self._maps
+        ids = self._key_ids.get(key)
+        if ids:
+            by_key[key] = by_id[min(ids)]
+        else:
+            self._key_ids.pop(key, None)
+            by_key.pop(key, None)
+
+    def put(self, product):
+        """Write-through for an added or updated product dict."""
+        pid = product["id"]
+        with self._lock:
+            by_id, by_key, ids, index = self._maps
+            old = by_id.get(pid)
+            by_id[pid] = product
+            self._key_ids.setdefault(_key(product), set()).add(pid)
+            if old is not None and _key(old) != _key(product):
+                self._key_ids[_key(old)].discard(pid)
+                self._rekey(_key(old))
+            self._rekey(_key(product))
+            index.add(product)
+            if old is None and (not ids or pid > ids[-1]):
+                ids.append(pid)  # new rows usually get the highest id
+            elif old is None:
+                i = bisect_left(ids, pid)
+                self._maps = (by_id, by_key, ids[:i] + [pid] + ids[i:], index)
+
+    def remove(self, product_id):
+        with self._lock:
+            by_id, by_key, ids, index = self._maps
+            old = by_id.get(product_id)
+            if old is None:
+                return
+            index.discard(product_id)
+            self._key_ids[_key(old)].discard(product_id)
+            self._rekey(_key(old))
+            i = bisect_left(ids, product_id)
+            self._maps = (by_id, by_key, ids[:i] + ids[i + 1:], index)
+            del by_id[product_id]
+
+    def get(self, product_id):
+        """Product by id. A miss reads that one row by primary key (and
+        caches it), so ids are answered from the database's truth even for
+        rows written without bumping the stamp."""
+        self.sync()
+        product = self._maps[0].get(product_id)
+        if product is not None:
+            self.hits += 1
+            return product
+        self.misses += 1
+        row = Product.rows_query().filter(Product.id == product_id).first()
+        if row is None:
+            return None
+        product = PRODUCT_ROW(row)
+        self.put(product)
+        return product
+
+    def find(self, name, category):
+        """Product with exactly this name and category (lowest id), or None."""
+        self.sync()
+        product = self._maps[1].get((name, category))
+        if product is None and self.sync(force=True):
+            product = self._maps[1].get((name, category))
+        if product is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return product
+
+    def resolve(self, name, category):
+        """Best product for a free-text device name within a category.
+
+        Tries an exact (name, category) hit, then a case-insensitive name,
+        then trigram similarity. Returns (product, match, score) with match
+        one of "exact", "ci", "fuzzy", or (None, None, best_score).
+        """
+        self.sync()
+        result = self._resolve(name, category)
+        if result[0] is None and self.sync(force=True):
+            result = self._resolve(name, category)
+        if result[0] is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.resolved[result[1] or "miss"] += 1
+        return result
+
+    def _resolve(self, name, category):
+        _, by_key, _, index = self._maps
+        product = by_key.get((name, category))
+        if product is not None:
+            return product, "exact", 1.0
+        return index.resolve(name, category)
+
+    def page(self, after_id=None, limit=100, version=None, **equals):
+        """Keyset page in id order, like paginate(..., descending=False).
+
+        `equals` filters on product fields; None/"" values are ignored.
+        `version` is the products stamp the response is validated against
+        (see conditional_get); if the catalog holds another one it syncs
+        now instead of waiting for the interval, so an ETag never labels
+        older rows. Returns (items, has_more).
+        """
+        self.sync(force=version is not None and version != self._version)
+        equals = {k: v for k, v in equals.items() if v not in (None, "")}
+        by_id, _, ids, _ = self._maps
+        start = bisect_right(ids, after_id) if after_id is not None else 0
+        items = []
+        for i in ids[start:]:
+            p = by_id.get(i)
+            if p is None:
+                continue  # removed since we took `ids`
+            if all(p[k] == v for k, v in equals.items()):
+                if len(items) == limit:
+                    self.hits += 1
+                    return items, True
+                items.append(p)
+        self.hits += 1
+        return items, False
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._maps[0]),
+            "version": self._version,
+            "reloads": self.reloads,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "resolved": dict(self.resolved),
+            "approx_bytes": _deep_size(self._maps[:3]),
+        }
+
+
+product_catalog = ProductCatalog()
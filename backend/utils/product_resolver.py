@@ -0,0 +1,135 @@
+import os
+import re
+from collections import Counter, defaultdict
+
+PRODUCT_MATCH_THRESHOLD = float(os.getenv("PRODUCT_MATCH_THRESHOLD", "0.5"))
+
+_WORD_RE = re.compile(r"\w+")
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def normalize(text):
+    return " ".join(_WORD_RE.findall((text or "").casefold()))
+
+
+def trigrams(text):
+    """pg_trgm-style trigram set: each word padded with two leading spaces
+    and one trailing space."""
+    grams = set()
+    for word in _WORD_RE.findall((text or "").casefold()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def model_numbers(text):
+    """Digit runs in a name ("iPhone 15 Pro" -> {"15"}); they tell models
+    of one line apart, so a fuzzy match must agree on them exactly."""
+    return frozenset(_NUMBER_RE.findall(text or ""))
+
+
+class ProductIndex:
+    """Name lookup index over a product list, scoped by category.
+
+    Per (normalized) category it holds a case-insensitive name map and a
+    trigram -> product ids posting list. Fuzzy matching only scores the
+    products sharing at least one trigram with the query, so a miss costs
+    a few dict lookups rather than a pass over the catalog. A fuzzy
+    candidate must carry the same model numbers as the query: "MacBook Pro
+    16" shares most trigrams with "MacBook Pro 14" but is another product.
+
+    add() and discard() update one product in place; callers serialize
+    them. Lookups may run concurrently without a lock: id sets are replaced
+    rather than mutated, and an id whose entry is already gone is skipped.
+    """
+
+    def __init__(self, products, threshold=PRODUCT_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._entries = {}  # id -> (product, category, name, trigrams, model numbers)
+        self._by_name = defaultdict(dict)   # category -> normalized name -> frozenset(ids)
+        self._postings = defaultdict(dict)  # category -> trigram -> frozenset(ids)
+        by_name = defaultdict(lambda: defaultdict(set))
+        postings = defaultdict(lambda: defaultdict(set))
+        for p in products:
+            entry = self._entry(p)
+            _, category, name, grams, _ = entry
+            self._entries[p["id"]] = entry
+            by_name[category][name].add(p["id"])
+            for g in grams:
+                postings[category][g].add(p["id"])
+        for category, names in by_name.items():
+            self._by_name[category] = {n: frozenset(ids) for n, ids in names.items()}
+        for category, grams in postings.items():
+            self._postings[category] = {g: frozenset(ids) for g, ids in grams.items()}
+
+    @staticmethod
+    def _entry(p):
+        return (p, normalize(p["category"]), normalize(p["name"]), frozenset(trigrams(p["name"])),
+                model_numbers(p["name"]))
+
+    def add(self, product):
+        """Index `product`, replacing any earlier version with its id."""
+        self.discard(product["id"])
+        entry = self._entry(product)
+        _, category, name, grams, _ = entry
+        pid = product["id"]
+        # Entry first, so a lookup never meets an id it cannot resolve
+        self._entries[pid] = entry
+        names = self._by_name[category]
+        names[name] = names.get(name, frozenset()) | {pid}
+        postings = self._postings[category]
+        for g in grams:
+            postings[g] = postings.get(g, frozenset()) | {pid}
+
+    def discard(self, product_id):
+        entry = self._entries.get(product_id)
+        if entry is None:
+            return
+        _, category, name, grams, _ = entry
+        names = self._by_name[category]
+        ids = names[name] - {product_id}
+        if ids:
+            names[name] = ids
+        else:
+            del names[name]
+        postings = self._postings[category]
+        for g in grams:
+            ids = postings[g] - {product_id}
+            if ids:
+                postings[g] = ids
+            else:
+                del postings[g]
+        del self._entries[product_id]
+
+    def _fuzzy(self, name, category):
+        grams = trigrams(name)
+        postings = self._postings.get(category)
+        if not grams or not postings:
+            return None, 0.0
+        shared = Counter()
+        for g in grams:
+            shared.update(postings.get(g, ()))
+        numbers = model_numbers(name)
+        best, best_score = None, 0.0
+        for pid, n in shared.items():
+            entry = self._entries.get(pid)
+            if entry is None or entry[4] != numbers:
+                continue
+            score = n / (len(grams) + len(entry[3]) - n)  # Jaccard similarity
+            if score > best_score or (score == best_score and pid < best[0]["id"]):
+                best, best_score = entry, score
+        if best is None or best_score < self.threshold:
+            return None, best_score
+        return best[0], best_score
+
+    def resolve(self, name, category):
+        """Return (product, match, score); match is "ci" or "fuzzy", or
+        (None, None, best_score) when nothing clears the threshold."""
+        category = normalize(category)
+        ids = self._by_name.get(category, {}).get(normalize(name))
+        if ids:
+            entry = self._entries.get(min(ids))  # lowest id wins
+            if entry is not None:
+                return entry[0], "ci", 1.0
+        product, score = self._fuzzy(name, category)
+        return product, ("fuzzy" if product else None), score
@@ -0,0 +1,113 @@
+import re
+import threading
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+SYSTEM_TEMPLATE = """
+You are a strict customer support chatbot.
+
+You must ONLY handle:
+- product issues
+- billing issues
+- account support
+- troubleshooting
+- refunds, returns, and order-related questions
+
+Below are the most relevant entries from the FAQ knowledge base:
+{faq_context}
+
+User asked: "{query}"
+
+Your rules:
+1. First check if the user's question MATCHES or is SIMILAR to any FAQ.
+2. If it matches, reply ONLY with the FAQ answer.
+3. If not in the FAQ, generate your own correct customer-support answer.
+4. If the query is NOT related to customer support, reply exactly:
+   "I can assist only with customer support–related queries."
+"""
+
+
+def count_tokens(text):
+    """Cheap token estimate (words and punctuation marks).
+
+    Close enough to BPE counts for English support text to enforce a
+    budget without pulling in a tokenizer dependency.
+    """
+    return len(_TOKEN_RE.findall(text or ""))
+
+
+def _truncate(text, max_tokens):
+    tokens = _TOKEN_RE.finditer(text)
+    for i, m in enumerate(tokens):
+        if i == max_tokens:
+            return text[:m.start()].rstrip() + "..."
+    return text
+
+
+class PromptBuilder:
+    """Render the chat system prompt within a token budget.
+
+    Rendered FAQ snippets and their token counts are cached per FAQ
+    version, so a request only joins strings it already has.
+    """
+
+    def __init__(self, token_budget=2000, max_query_tokens=300):
+        self.token_budget = token_budget
+        self.max_query_tokens = max_query_tokens
+        self._template_tokens = count_tokens(SYSTEM_TEMPLATE.format(faq_context="", query=""))
+        self._snippets = {}  # faq id -> (text, tokens)
+        self._version = None
+        self._lock = threading.Lock()
+        self.built = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.trimmed = 0
+
+    def _snippet(self, faq):
+        cached = self._snippets.get(faq["id"])
+        if cached is None:
+            text = f"Q: {faq['question']}\nA: {faq['answer']}"
+            cached = self._snippets[faq["id"]] = (text, count_tokens(text) + 1)
+        return cached
+
+    def build(self, query, faqs, version):
+        """Return the system prompt for `query` using `faqs`, best first."""
+        with self._lock:
+            if version != self._version:
+                self._snippets.clear()
+                self._version = version
+            snippets = [self._snippet(f) for f in faqs]
+
+        max_query = min(self.max_query_tokens, max(self.token_budget - self._template_tokens, 0))
+        query_tokens = count_tokens(query)
+        if query_tokens > max_query:
+            query = _truncate(query, max_query)
+            query_tokens = max_query
+
+        used = self._template_tokens + query_tokens
+        parts = []
+        for text, tokens in snippets:
+            if used + tokens > self.token_budget:
+                break
+            parts.append(text)
+            used += tokens
+
+        with self._lock:
+            self.built += 1
+            self.total_tokens += used
+            self.max_tokens = max(self.max_tokens, used)
+            if len(parts) < len(snippets):
+                self.trimmed += 1
+
+        return SYSTEM_TEMPLATE.format(faq_context="\n\n".join(parts), query=query)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "token_budget": self.token_budget,
+                "prompts_built": self.built,
+                "avg_tokens": (self.total_tokens / self.built) if self.built else 0.0,
+                "max_tokens": self.max_tokens,
+                "trimmed": self.trimmed,
+                "cached_snippets": len(self._snippets),
+            }
@@ -0,0 +1,48 @@
+from sqlalchemy import DateTime
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class RowSerializer:
+    """Turn plain SELECT rows into the same dicts as Model.to_dict().
+
+    `fields` is an ordered list of (key, column) or (key, RowSerializer)
+    pairs; a nested serializer's columns are selected alongside (through a
+    join) and become a sub-dict, or None when its first column is NULL.
+    Read-only list endpoints use this to skip ORM object construction.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.width = sum(f.width if isinstance(f, RowSerializer) else 1 for _, f in fields)
+        self._plan = []
+        pos = 0
+        for key, f in fields:
+            if isinstance(f, RowSerializer):
+                self._plan.append((key, pos, f))
+                pos += f.width
+            else:
+                self._plan.append((key, pos, _iso if isinstance(f.type, DateTime) else None))
+                pos += 1
+
+    def columns(self, prefix=""):
+        cols = []
+        for key, f in self.fields:
+            if isinstance(f, RowSerializer):
+                cols += f.columns(f"{prefix}{key}__")
+            else:
+                cols.append(f.label(prefix + key))
+        return cols
+
+    def __call__(self, row, offset=0):
+        out = {}
+        for key, pos, conv in self._plan:
+            if isinstance(conv, RowSerializer):
+                out[key] = conv(row, offset + pos) if row[offset + pos] is not None else None
+            elif conv is None:
+                out[key] = row[offset + pos]
+            else:
+                out[key] = conv(row[offset + pos])
+        return out
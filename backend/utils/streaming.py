@@ -0,0 +1,34 @@
+from flask import Response, request, stream_with_context, current_app
+from utils.json_provider import dumps
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson():
+    """True for ?format=ndjson or an Accept header preferring NDJSON."""
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def ndjson_response(query, key_column, serialize):
+    """Stream every row of `query` as newline-delimited JSON.
+
+    Rows are fetched `NDJSON_CHUNK_SIZE` at a time with yield_per and each
+    chunk is written as soon as it is serialized, so memory stays flat and
+    the first rows go out before the query has finished.
+    """
+    chunk_size = current_app.config.get("NDJSON_CHUNK_SIZE", 1000)
+    rows = query.order_by(key_column.asc()).yield_per(chunk_size)
+
+    def generate():
+        buf = []
+        for row in rows:
+            buf.append(dumps(serialize(row)))
+            if len(buf) >= chunk_size:
+                yield "\n".join(buf) + "\n"
+                buf.clear()
+        if buf:
+            yield "\n".join(buf) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,298 @@
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from flask import request, current_app
+from sqlalchemy import cast, func, select
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models.ticket import Ticket
+from models.user import User
+from models.product import Product
+from models.agent_stats import AgentStats
+from models.counter import Counter, TICKETS_TOTAL, TICKETS_CLOSED
+from utils.streaming import NDJSON_MIMETYPE
+
+
+def _int(v):
+    if isinstance(v, bool) or not isinstance(v, (int, str)):
+        raise ValueError("must be an integer")
+    return int(v)
+
+
+def _date(v):
+    if not isinstance(v, str):
+        raise ValueError("must be an ISO datetime")
+    value = datetime.fromisoformat(v)
+    if value.tzinfo is not None:
+        # Columns hold naive local time (datetime.now() defaults)
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _text(max_len=None):
+    def parse(v):
+        if not isinstance(v, str):
+            raise ValueError("must be a string")
+        if max_len and len(v) > max_len:
+            raise ValueError(f"longer than {max_len} characters")
+        return v
+    return parse
+
+
+# name -> (parser, required); parsers raise ValueError with a message
+FIELDS = {
+    'id': (_int, False),
+    'description': (_text(), True),
+    'status': (_text(50), False),
+    'customer_id': (_int, True),
+    'product_id': (_int, False),
+    'assigned_to': (_int, False),
+    'created_at': (_date, False),
+    'closed_at': (_date, False),
+    'pickup_date': (_date, False),
+    'preferred_time_slot': (_text(30), False),
+    'contact': (_text(30), False),
+    'pickup_address': (_text(), False),
+}
+
+# Foreign keys checked with one IN query per column over the whole upload
+_REFERENCES = {
+    'customer_id': User.id,
+    'assigned_to': User.id,
+    'product_id': Product.id,
+}
+
+_IN_CHUNK = 5000
+
+
+class TicketImportError(ValueError):
+    """Upload that cannot be read at all; reported to the client as a 400."""
+
+
+class _BadLine(str):
+    """Error message standing in for an NDJSON line that is not JSON."""
+
+
+def read_upload():
+    """Parse the request body as a JSON array or NDJSON.
+
+    Returns a list of (row, obj) with rows numbered from 0 in input order
+    (non-blank NDJSON lines); an NDJSON line that is not valid JSON yields
+    a _BadLine error message instead of an object.
+    """
+    body = request.get_data(as_text=True)
+    max_rows = current_app.config.get("TICKET_IMPORT_MAX_ROWS", 100000)
+
+    if request.mimetype == NDJSON_MIMETYPE or request.args.get("format") == "ndjson":
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((len(items), json.loads(line)))
+            except ValueError as e:
+                items.append((len(items), _BadLine(f"invalid JSON: {e}")))
+    else:
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise TicketImportError(f"invalid JSON: {e}")
+        if not isinstance(data, list):
+            raise TicketImportError("body must be a JSON array of tickets")
+        items = list(enumerate(data))
+
+    if len(items) > max_rows:
+        raise TicketImportError(f"too many rows: {len(items)} > {max_rows}")
+    return items
+
+
+def _existing(column, values):
+    found = set()
+    values = list(values)
+    for i in range(0, len(values), _IN_CHUNK):
+        chunk = values[i:i + _IN_CHUNK]
+        found.update(v for (v,) in db.session.query(column).filter(column.in_(chunk)))
+    return found
+
+
+def validate(items):
+    """Validate every row; returns (valid [(row, values)], errors).
+
+    Field checks run row by row, then each foreign key and explicit id is
+    checked for the whole upload in one set-based query, so the number of
+    queries does not depend on the number of rows.
+    """
+    parsed, errors = [], []
+    now = datetime.now()
+    for row, obj in items:
+        if isinstance(obj, _BadLine):
+            errors.append({'row': row, 'error': obj})
+            continue
+        if not isinstance(obj, dict):
+            errors.append({'row': row, 'error': 'row must be an object'})
+            continue
+        values, problems = {}, []
+        for name, (parse, required) in FIELDS.items():
+            raw = obj.get(name)
+            if raw is None or raw == "":
+                if required:
+                    problems.append(f"{name} is required")
+                values[name] = None
+                continue
+            try:
+                values[name] = parse(raw)
+            except (TypeError, ValueError) as e:
+                problems.append(f"{name}: {e}")
+        if problems:
+            errors.append({'row': row, 'error': '; '.join(problems)})
+            continue
+        values['status'] = values['status'] or 'Open'
+        values['created_at'] = values['created_at'] or now
+        if values['closed_at'] and values['closed_at'] < values['created_at']:
+            errors.append({'row': row, 'error': 'closed_at is before created_at'})
+            continue
+        parsed.append((row, values))
+
+    wanted = defaultdict(set)
+    for _, values in parsed:
+        for name in _REFERENCES:
+            if values[name] is not None:
+                wanted[name].add(values[name])
+    missing = {
+        name: wanted[name] - _existing(column, wanted[name])
+        for name, column in _REFERENCES.items() if wanted[name]
+    }
+
+    ids = [values['id'] for _, values in parsed if values['id'] is not None]
+    taken = _existing(Ticket.id, set(ids)) if ids else set()
+    seen_ids = set()
+
+    valid = []
+    for row, values in parsed:
+        problems = [
+            f"{name} {values[name]} does not exist"
+            for name in missing if values[name] in missing[name]
+        ]
+        if values['id'] is not None:
+            if values['id'] in taken or values['id'] in seen_ids:
+                problems.append(f"id {values['id']} already exists")
+            seen_ids.add(values['id'])
+        if problems:
+            errors.append({'row': row, 'error': '; '.join(problems)})
+        else:
+            valid.append((row, values))
+    return valid, errors
+
+
+def _stage_side_effects(rows):
+    """Counters and agent stats for `rows`, in the caller's transaction."""
+    Counter.add(TICKETS_TOTAL, len(rows))
+    Counter.add(TICKETS_CLOSED, sum(1 for r in rows if r['status'] == 'Closed'))
+    resolved = defaultdict(lambda: [0, 0.0])
+    for r in rows:
+        if r['assigned_to'] and r['closed_at']:
+            agent = resolved[r['assigned_to']]
+            agent[0] += 1
+            agent[1] += (r['closed_at'] - r['created_at']).total_seconds()
+    for user_id, (count, seconds) in resolved.items():
+        AgentStats.add_resolutions(user_id, count, seconds)
+
+
+def _insert(rows):
+    # Rows without an explicit id leave it out so the database assigns one;
+    # executemany needs the same keys in every row of a statement.
+    with_id = [r for r in rows if r['id'] is not None]
+    without_id = [{k: v for k, v in r.items() if k != 'id'} for r in rows if r['id'] is None]
+    if with_id:
+        _advance_id_sequence(max(r['id'] for r in with_id))
+    for group in (with_id, without_id):
+        if group:
+            db.session.execute(Ticket.__table__.insert(), group)
+    _stage_side_effects(rows)
+    db.session.commit()
+
+
+def id_sequence_statement(max_id):
+    """SELECT that moves the tickets id sequence to at least `max_id`."""
+    sequence = cast(func.pg_get_serial_sequence(Ticket.__tablename__, 'id'), REGCLASS)
+    return select(func.setval(sequence, func.greatest(func.nextval(sequence), max_id)))
+
+
+def _advance_id_sequence(max_id):
+    # Explicit ids bypass the Postgres SERIAL sequence; move it past them
+    # (never backwards) before they are inserted, so the batch's inserts
+    # without an id, and later ones, do not draw a taken id. SQLite
+    # assigns max(rowid) + 1 and needs nothing.
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(id_sequence_statement(max_id))
+
+
+def insert_batches(valid, batch_size):
+    """Insert `valid` rows in batches, one executemany and one commit each.
+
+    A batch that fails (e.g. a constraint violated by a concurrent writer)
+    is rolled back and retried row by row so the error can be pinned to
+    its row. Any other failure stops the import; rows already committed
+    stay, and `resume_row` is the input row to resend from. Returns
+    (inserted, errors, batches, failure) where failure is None or
+    (message, resume_row).
+    """
+    inserted, errors, batches = 0, [], 0
+    done = 0  # valid rows committed or reported so far
+    try:
+        for start in range(0, len(valid), batch_size):
+            batch = valid[start:start + batch_size]
+            batches += 1
+            try:
+                _insert([values for _, values in batch])
+                inserted += len(batch)
+                done += len(batch)
+                continue
+            except SQLAlchemyError:
+                db.session.rollback()
+            for row, values in batch:
+                try:
+                    _insert([values])
+                    inserted += 1
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    errors.append({'row': row, 'error': str(getattr(e, 'orig', e))})
+                done += 1
+    except Exception as e:
+        db.session.rollback()
+        return inserted, errors, batches, (str(e), valid[done][0])
+    return inserted, errors, batches, None
+
+
+def import_tickets(items, batch_size):
+    """Validate and insert `items`; returns the import report.
+
+    If the import stopped part way, the report also has `error` and
+    `resume_from_row`.
+    """
+    started = time.perf_counter()
+    valid, errors = validate(items)
+    validated = time.perf_counter()
+    inserted, insert_errors, batches, failure = insert_batches(valid, batch_size)
+    finished = time.perf_counter()
+
+    errors = sorted(errors + insert_errors, key=lambda e: e['row'])
+    elapsed = finished - started
+    report = {
+        'received': len(items),
+        'inserted': inserted,
+        'failed': len(errors),
+        'errors': errors,
+        'batch_size': batch_size,
+        'batches': batches,
+        'validate_seconds': round(validated - started, 4),
+        'insert_seconds': round(finished - validated, 4),
+        'rows_per_second': round(inserted / elapsed, 1) if elapsed else 0.0,
+    }
+    if failure:
+        # Rows from resume_from_row on were not imported (errors only
+        # lists problems found before the failure)
+        report['error'], report['resume_from_row'] = failure
+    return report
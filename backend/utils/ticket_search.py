@@ -0,0 +1,110 @@
+import re
+from sqlalchemy import Column, Integer, MetaData, Table, Text, and_, func, literal, literal_column, or_, select, text
+from extensions import db
+from models.ticket import Ticket
+
+# SQLite: external-content FTS5 table over tickets.description, kept in step
+# by triggers so every write path (ORM, bulk SQL) updates it.
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+        description, content='tickets', content_rowid='id', tokenize='porter unicode61')""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO tickets_fts(rowid, description) VALUES (new.id, new.description);
+    END""",
+]
+
+# Postgres: GIN expression index; the planner uses it for any query that
+# repeats the same to_tsvector expression, so nothing needs syncing.
+TS_CONFIG = 'english'
+POSTGRES_DDL = [
+    f"""CREATE INDEX IF NOT EXISTS ix_tickets_description_fts ON tickets
+        USING GIN (to_tsvector('{TS_CONFIG}', coalesce(description, '')))""",
+]
+
+_fts = Table('tickets_fts', MetaData(), Column('rowid', Integer), Column('description', Text))
+_TERM_RE = re.compile(r"\w+")
+
+
+class SearchError(ValueError):
+    """Unusable search query; reported to the client as a 400."""
+
+
+def ensure_search_index():
+    """Create the full-text index for the current database if missing.
+
+    On SQLite the FTS table is rebuilt from tickets whenever its triggers
+    had to be (re)created, e.g. after db.drop_all() in seed_data.py.
+    """
+    bind = db.session.get_bind()
+    dialect = bind.dialect.name
+    if dialect == 'postgresql':
+        for ddl in POSTGRES_DDL:
+            db.session.execute(text(ddl))
+    elif dialect == 'sqlite':
+        had_triggers = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'tickets_fts_ai'"
+        )).first()
+        for ddl in SQLITE_DDL:
+            db.session.execute(text(ddl))
+        if not had_triggers:
+            db.session.execute(text("INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')"))
+    db.session.commit()
+
+
+def search_terms(q):
+    terms = _TERM_RE.findall((q or '').lower())
+    if not terms:
+        raise SearchError("q must contain at least one word")
+    return terms
+
+
+def search_query(q, match_any=False):
+    """Ticket rows (as Ticket.rows_query) matching `q`, plus a `score`
+    column where lower is better. Returns (query, score_column)."""
+    terms = search_terms(q)
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # Quote every term so user input can never be FTS5 syntax
+        expr = (' OR ' if match_any else ' ').join(f'"{t}"' for t in terms)
+        matches = (
+            select(_fts.c.rowid.label('id'), literal_column('bm25(tickets_fts)').label('score'))
+            .where(literal_column('tickets_fts').op('MATCH')(expr))
+            .subquery()
+        )
+        query = Ticket.rows_query().add_columns(matches.c.score).join(matches, matches.c.id == Ticket.id)
+        return query, matches.c.score
+
+    if dialect == 'postgresql':
+        tsquery = func.to_tsquery(TS_CONFIG, (' | ' if match_any else ' & ').join(terms))
+        vector = func.to_tsvector(TS_CONFIG, func.coalesce(Ticket.description, ''))
+        score = (-func.ts_rank(vector, tsquery)).label('score')
+        query = Ticket.rows_query().add_columns(score).filter(vector.op('@@')(tsquery))
+        return query, score
+
+    # No full-text support: unranked substring match
+    likes = [Ticket.description.ilike(f'%{t}%') for t in terms]
+    score = literal(0.0).label('score')
+    query = Ticket.rows_query().add_columns(score).filter(or_(*likes) if match_any else and_(*likes))
+    return query, score
+
+
+def search_page(query, score, after=None, limit=20):
+    """Keyset page ordered by (score, id); `after` is the last (score, id)
+    seen. Returns (rows, next_key); next_key is None on the last page."""
+    if after is not None:
+        last_score, last_id = after
+        query = query.filter(or_(score > last_score, and_(score == last_score, Ticket.id > last_id)))
+    rows = query.order_by(score, Ticket.id).limit(limit + 1).all()
+    next_key = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_key = (rows[-1].score, rows[-1].id)
+    return rows, next_key
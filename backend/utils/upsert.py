@@ -0,0 +1,44 @@
+from extensions import db
+
+
+def _insert_for(dialect):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def upsert_increment(model, key, deltas, values=None, connection=None):
+    """Atomically add `deltas` to the row identified by `key`, creating it
+    (with the deltas as initial values) if it does not exist yet.
+    `values` are plain column assignments applied on insert and update.
+
+    Runs as one INSERT ... ON CONFLICT DO UPDATE in the caller's
+    transaction (or on `connection`, if given), so concurrent writers
+    never lose an increment.
+    """
+    table = model.__table__
+    values = values or {}
+    target = connection if connection is not None else db.session
+    dialect = connection.dialect if connection is not None else db.session.get_bind().dialect
+    insert = _insert_for(dialect.name)
+    if insert is None:
+        # Portable fallback: UPDATE, and INSERT if no row was touched
+        updated = target.execute(
+            table.update()
+            .where(*(table.c[k] == v for k, v in key.items()))
+            .values({**{k: table.c[k] + v for k, v in deltas.items()}, **values})
+        ).rowcount
+        if not updated:
+            target.execute(table.insert().values(**key, **deltas, **values))
+        return
+
+    stmt = insert(table).values(**key, **deltas, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={**{k: table.c[k] + stmt.excluded[k] for k in deltas}, **values},
+    )
+    target.execute(stmt)
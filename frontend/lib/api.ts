@@ -1,7 +1,7 @@
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:5000'
 
 // Helper function for API requests
-async function apiRequest<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+async function apiFetch(endpoint: string, options: RequestInit = {}): Promise<Response> {
   const url = `${API_BASE_URL}${endpoint}`
   
   const config: RequestInit = {
@@ -30,9 +30,29 @@ async function apiRequest<T>(endpoint: string, options: RequestInit = {}): Promi
     throw new Error(errorData.error || `HTTP ${response.status}: ${response.statusText}`)
   }
   
+  return response
+}
+
+async function apiRequest<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
+  const response = await apiFetch(endpoint, options)
   return response.json()
 }
 
+// Keyset-paginated list endpoints return one page and put the next page's
+// cursor in X-Next-Cursor; follow it until the last page
+async function apiRequestAll<T>(endpoint: string, limit = 500): Promise<T[]> {
+  const items: T[] = []
+  const separator = endpoint.includes('?') ? '&' : '?'
+  let cursor: string | null = null
+  do {
+    const query = `limit=${limit}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '')
+    const response: Response = await apiFetch(`${endpoint}${separator}${query}`)
+    items.push(...(await response.json()))
+    cursor = response.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return items
+}
+
 // API endpoints
 export const api = {
   // Authentication
@@ -53,7 +73,7 @@ export const api = {
     apiRequest<any[]>('/api/tickets/test_tickets'),
 
   getAllTicketsAuth: () =>
-    apiRequest<any[]>('/api/tickets/get_all_ticket'),
+    apiRequestAll<any>('/api/tickets/get_all_ticket'),
 
   createTicket: (ticketData: any) =>
     apiRequest<{ ticket: any }>('/api/tickets/create', {
@@ -91,7 +111,7 @@ export const api = {
     apiRequest<any[]>('/api/orders/test_orders'),
 
   getAllOrdersAuth: () =>
-    apiRequest<any[]>('/api/orders/get_all_orders'),
+    apiRequestAll<any>('/api/orders/get_all_orders'),
 
   createOrder: (orderData: any) =>
     apiRequest<{ order: any }>('/api/orders/create', {